@@ -11,13 +11,9 @@
 #
 #   {WEBSITE}
 
-from enum import Enum
 import sys
 import os
-import traceback
 import argparse
-import re
-import operator
 import time
 
 def main():
@@ -67,6 +63,7 @@ if __name__ == '__main__':
     except SystemExit as e: # sys.exit()
         raise e
     except Exception as e:
+        import traceback
         print('Error: Unexpected Exception')
         print(str(e))
         traceback.print_exc()
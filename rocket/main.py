@@ -9,8 +9,6 @@
 #   http://gibsjose.com
 #   http://github.com/gibsjose/Rocket
 
-# @TODO Look into using inflection library for camel-case, etc. https://inflection.readthedocs.org/en/latest/
-#       Inflection will solve the bug where naming projects certain ways results in their naming being incorrect
 # @TODO Make the `extension` attribute for Python have a local override in `config.json` to more easily decide on using `.py` extension
 # @TODO ^^^^^ Maybe there is a `config.json` in each language folder??? Probably best!
 # @TODO Add support for {DATE} formatting... i.e. '{DD MONTH YYYY}' or '{MM.DD.YYYY}', etc.
@@ -19,210 +17,449 @@
 # @TODO Add an `simple` T/F attribute to Python config.json. Use current structure, etc. when True, otherwise use the project structure used for Rocket...
 
 # Essential Modules
-from enum import Enum
 import sys
 import os
-import traceback
 import argparse
-import re
-import operator
 import time
-import datetime
-import tempfile
-import stat
-import glob
-
-# Other Modules
-import json         # JSON
-import shutil       # File Copying, `which()`, etc.
-import subprocess   # Call shell commands for `git`
 
 # Local Modules
-from rocket.language import Language
-import rocket.language
-import rocket.configuration
-import rocket.filler
-import rocket.namer
-
-# Global language dictionary
-LanguageDictionary = {
-    'c': Language.c,
-    'cpp': Language.cpp,
-    'c++': Language.cpp,
-    'avr-c': Language.avr_c,
-    'avr-cpp': Language.avr_cpp,
-    'avr-c++': Language.avr_cpp,
-    'python': Language.python
-}
-
-# Matches language names with their template directory name
-LanguageNameDictionary = {
-    'c': 'c',
-    'cpp': 'cpp',
-    'c++': 'cpp',
-    'avr-c': 'avr-c',
-    'avr-cpp': 'avr-cpp',
-    'avr-c++': 'avr-cpp',
-    'python': 'python'
-}
+# Every Rocket module (and everything else, including `enum`, `json`, `shutil`
+# and `subprocess`) is imported by the command that needs it, so `rocket
+# --help` and each command only pay for the modules they actually use
+
+# `fsync` modes of generated files (`rocket.writer.SyncModes`, which `--help` does not import)
+SyncModes = ['off', 'file', 'project']
+
+def Jobs(value):
+    """
+    `-j/--jobs` argument: a number of workers, 0 for the default
+    """
+    try:
+        jobs = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError('invalid number of jobs: \'' + value + '\'')
+
+    if jobs < 0:
+        raise argparse.ArgumentTypeError('invalid number of jobs: \'' + value + '\': Must be 0 (default) or more')
+
+    return jobs
 
 class Rocket:
     """
     Defines the Rocket object for creating project/code templates
     """
-    def __init__(self):
+    def __init__(self, sync='off', r_dir=None):
         """
-        Rocket default constructor
+        Rocket default constructor, with the fsync mode for generated files and
+        the Rocket directory (default: found from the running script)
         """
+        from rocket.language import Language
+        import rocket.writer
+
         self.language = Language.unknown
-        self.dir = os.path.dirname(os.path.dirname(os.path.realpath(sys.argv[0])))
+        self.dir = r_dir or os.path.dirname(os.path.dirname(os.path.realpath(sys.argv[0])))
+        self.cache = None
+        self.registry = None
+        self.writer = rocket.writer.FileWriter(sync)
 
-    def Create(self, language, project):
+    def Registry(self):
+        """
+        The language registry, loaded (through the cache) on first use
+        """
+        import rocket.cache
+        import rocket.registry
+
+        if self.registry is None:
+            if self.cache is None:
+                self.cache = rocket.cache.Cache(self.dir)
+            self.registry = rocket.registry.Registry(self.dir + '/languages', self.cache).Load()
+
+        return self.registry
+
+    def Create(self, language, project, directory=None, overrides=None, link=False):
         """
         Generates the skeleton code, makefiles (if necessary), gitignore
         files, etc. and generates a default `config.json` object with the correct language
+
+        The project is created in `directory` (default: the current directory),
+        and any `overrides` are merged into the generated `config.json`. With
+        `link`, skeleton files that are never templated are hardlinked.
         """
+        import rocket.configuration
+        import rocket.materializer
+        import rocket.profiler
+        import rocket.state
+        from rocket.language import Language
+
         # Set language
         # - 'language' is the user's raw input
-        # - 'lang' is a lowercase version of 'language'
+        # - 'entry' is the language's registry entry (any alias, any case, e.g. 'C++')
         # - 'self.language' is the actual language type enum (e.g. Language.cpp)
         # - 'language_name' is the accepted language name by Rocket (e.g. 'C++' turn to 'cpp')
-        lang = language.lower()
-        if lang in LanguageDictionary:
-            self.language = LanguageDictionary[lang]
-            language_name = LanguageNameDictionary[lang]
-        else:
+        with rocket.profiler.Record('registry'):
+            entry = self.Registry().Find(language)
+        if entry is None:
             self.language = Language.unknown
-            language_name = 'unknown'
-            raise Exception('Unknown language')
+            raise Exception('Unknown language \'' + language + '\': Must be one of ' + ', '.join(self.Registry().Names()))
+
+        self.language = entry.language
+        language_name = entry.name
 
         print('\t> Copying from Rocket directory: ' + self.dir)
 
         # Pull correct files and copy them to local directory
-        directory = os.getcwd()
+        if directory is None:
+            directory = os.getcwd()
         print('\t> Current directory: ' + directory)
 
         # Write a default `config.json` file with the correct language
         # Read in the default file, change the language attribute, and write it
         self.configuration = rocket.configuration.Configuration()
-        self.configuration.Modify(self.dir + '/config.json', directory + '/config.json', language_name, project)
+        with rocket.profiler.Record('config.json'):
+            self.configuration.Modify(self.dir + '/config.json', directory + '/config.json', language_name, project, overrides, self.writer)
         print('\t> Created default ' + language + ' configuration file \'./config.json\'')
 
-        # @TODO Make this more modular by using the language's 'language.json' file and a LanguageConfiguration object
-        # Make directories and copy files as needed for specific languages
-        if (self.language == Language.c) or (self.language == Language.cpp) or (self.language == Language.avr_c) or (self.language == Language.avr_cpp):
+        # Make directories and copy files as listed by the language's registry entry
+        # Only source files are ever templated, so anything else may be hardlinked
+        materializer = rocket.materializer.Materializer(self.writer, link)
+        sources = tuple(entry.configuration.sources)
+        source_directory = os.path.join(directory, entry.configuration.source_directory)
+        if entry.skeleton:
             # Create necessary directories
-            if not os.path.exists(directory + '/src/'):
-                os.makedirs(directory + '/src/')
-                print('\t> Created source directory \'./src/\'')
+            if not os.path.exists(source_directory):
+                os.makedirs(source_directory)
+                print('\t> Created source directory \'./' + entry.configuration.source_directory + '/\'')
 
             # Copy the skeleton code
-            if (self.language == Language.c) or (self.language == Language.avr_c):
-                shutil.copy(self.dir + '/languages/' + language_name + '/skeleton/rocket.c', directory + '/src/')
-                shutil.copy(self.dir + '/languages/' + language_name + '/skeleton/rocket.h', directory + '/src/')
-                print('\t> Created skeleton \'.c\' and \'.h\' files in \'./src/\'')
-            else:
-                shutil.copy(self.dir + '/languages/' + language_name + '/skeleton/rocket.cpp', directory + '/src/')
-                shutil.copy(self.dir + '/languages/' + language_name + '/skeleton/rocket.h', directory + '/src/')
-                print('\t> Created skeleton \'.cpp\' and \'.h\' files in \'./src/\'')
-
-            # Copy the makefile
-            shutil.copy(self.dir + '/languages/' + language_name + '/makefile', directory)
+            with rocket.profiler.Record('skeleton'):
+                materializer.Tree(os.path.join(entry.directory, 'skeleton'), source_directory, entry.skeleton, lambda f: not f.endswith(sources))
+            print('\t> Created skeleton ' + ', '.join('\'' + f + '\'' for f in entry.skeleton) + ' in \'./' + entry.configuration.source_directory + '\'')
+
+        # Copy the makefile
+        if entry.makefile:
+            with rocket.profiler.Record('makefile'):
+                materializer.Copy(entry.makefile, os.path.join(directory, 'makefile'))
             print('\t> Created ' + language + ' \'./makefile\'')
 
-        elif self.language == Language.python:
-            shutil.copy(self.dir + '/languages/' + language_name + '/skeleton/rocket.py', directory)
-            print('\t> Created skeleton \'.py\' file')
+        # Manifest of the new files, which `rocket config` renames and configures
+        state = rocket.state.State(directory, entry.directory)
+        state.Created(directory + '/config.json')
+        for f in entry.skeleton:
+            state.Created(os.path.join(source_directory, f), os.path.join('skeleton', f))
+        if entry.makefile:
+            state.Created(os.path.join(directory, 'makefile'), 'makefile')
+        state.Save(self.writer)
+
+        with rocket.profiler.Record('sync'):
+            self.writer.Sync()
 
-    def Config(self):
+    def Config(self, directory=None, jobs=1, pool='thread', git=True):
         """
         Pull from the generated and (maybe) edited `config.json` file, and
         make changes to comment header blocks
+
+        Configures the project in `directory` (default: the current directory),
+        rendering up to `jobs` source files at once in a 'thread' or 'process'
+        pool; the `git` repository is only set up if `git` is set
         """
+        import stat
+        import rocket.configuration
+        import rocket.filler
+        import rocket.generator
+        import rocket.namer
+        import rocket.profiler
+        import rocket.state
+
+        if directory is None:
+            directory = os.getcwd()
+
         # Create a configuration object
         self.configuration = rocket.configuration.Configuration()
 
         # Decode the configuration object
-        self.configuration.Decode(os.getcwd() + '/config.json')
+        with rocket.profiler.Record('decode'):
+            self.configuration.Decode(directory + '/config.json', self.Registry())
+        entry = self.configuration.language_entry
+
+        # What the last `rocket config` generated, so unchanged files are skipped
+        state = rocket.state.State(directory, entry.directory).Load()
 
-        if self.configuration.language_string in LanguageNameDictionary:
-            language_name = LanguageNameDictionary[self.configuration.language_string]
+        # Keep the date of the first `rocket config` so re-runs do not touch every header
+        if state.data['date']:
+            self.configuration.date = state.data['date']
         else:
-            language_name = 'unknown'
+            state.data['date'] = self.configuration.date
 
         print('\t> Generated date: ' + self.configuration.date)
         print('\t> Detected language: ' + self.configuration.language_string)
         print('\t> Detected project name: ' + self.configuration.project)
 
         # Modify skeleton files/makefiles with data from `config.json`
-        directory = os.getcwd()
-
         # Rename skeleton code files to project name
-        file_namer = rocket.namer.FileNamer(self.configuration, self.dir)
-        files = file_namer.Rename()
+        manifest = state.Manifest()
+        file_namer = rocket.namer.FileNamer(self.configuration, self.writer)
+        with rocket.profiler.Record('rename'):
+            files = file_namer.Rename(directory, manifest)
+
+        # Skeleton files renamed for the first time are re-rendered from the language's copy later on
+        source_directory = os.path.join(directory, entry.configuration.source_directory)
+        for old, new in zip(file_namer.files, files):
+            if manifest is not None:
+                source = manifest.get(state.Key(old))
+                state.Moved(old, new)
+            else:
+                source = os.path.join('skeleton', os.path.relpath(old, source_directory))
+
+            if source and os.path.exists(os.path.join(entry.directory, source)):
+                state.Origin(new, source)
+        state.Origin(directory + '/makefile', 'makefile')
 
         # Modify skeleton code (and makefile if necessary)
-        comment_filler = rocket.filler.CommentFiller(self.configuration)
-        comment_filler.Replace(files)
+        comment_filler = rocket.filler.CommentFiller(self.configuration, self.cache, self.writer, state, jobs, pool)
+        makefile_filler = rocket.filler.MakefileFiller(self.configuration, self.writer, state)
+
+        # Files rendered before a failure are still recorded
+        try:
+            with rocket.profiler.Record('comments'):
+                comment_filler.Replace(files)
 
-        makefile_filler = rocket.filler.MakefileFiller(self.configuration)
-        makefile_filler.Replace(directory + '/makefile', file_namer.name)
+            makefile_filler.Replace(directory + '/makefile', file_namer.name)
 
-        # Re-apply executable privilages for Python scripts
-        if self.configuration.language == Language.python:
+        finally:
+            state.Save(self.writer)
+
+        # Re-apply executable privilages for scripts (e.g. Python)
+        if entry.configuration.executable:
             for f in files:
                 os.chmod(f, stat.S_IRWXU)
 
+        # Files made by `rocket config` itself, added to the manifest for `rocket clean`
+        generated = []
+
+        # Python scripts: cached bytecode, and a single-file zipapp to ship
+        scripts = [f for f in files if f.endswith('.py')]
+        if scripts and self.configuration.build.get('bytecode'):
+            import rocket.bytecode
+            with rocket.profiler.Record('bytecode'):
+                compiled = rocket.bytecode.Compile(scripts)
+            print('\t> Compiled ' + str(len(compiled)) + ' Python file(s)')
+            generated += compiled
+
+        # Generated files the language's `.gitignore` does not ignore
+        shipped = []
+
+        if scripts and self.configuration.build.get('zipapp'):
+            import rocket.bytecode
+            script = os.path.join(source_directory, file_namer.name + '.py')
+            if os.path.exists(script):
+                zipapp = os.path.join(directory, file_namer.name + '.pyz')
+                with rocket.profiler.Record('zipapp', zipapp):
+                    with open(script, 'rb') as script_file:
+                        source = script_file.read()
+                    written = self.writer.Update(zipapp, rocket.bytecode.Zipapp(source), rocket.bytecode.ZipappMode)
+                generated.append(zipapp)
+                shipped.append(zipapp)
+                print('\t> ' + ('Created ' if written else 'Unchanged ') + os.path.basename(zipapp))
+            else:
+                print('\t* Warning: No \'' + os.path.basename(script) + '\' to build a zipapp from')
+
         # If project will be a `git` repo add `.gitignore` and `README.md`
         if self.configuration.git:
             # Create README
-            with open(directory + '/README.md', 'w') as readme:
-                readme.write('# ' + self.configuration.project + '\n')
-                readme.write(self.configuration.date + '\n')
-                # @TODO Write license/other info here
-
-            # Copy the `.gitignore`
-            shutil.copy(self.dir + '/languages/' + language_name + '/' + language_name + '.gitignore', directory + '/.gitignore')
+            with rocket.profiler.Record('readme'):
+                self.writer.Update(directory + '/README.md', rocket.generator.Readme(self.configuration))
+
+            with rocket.profiler.Record('gitignore'):
+                # Copy the `.gitignore`
+                gitignore = ''
+                if entry.gitignore:
+                    with open(entry.gitignore) as gi:
+                        gitignore = gi.read()
+                    rocket.profiler.Read(len(gitignore))
+
+                self.writer.Update(directory + '/.gitignore', rocket.generator.GitIgnore(entry, file_namer.name, gitignore))
             print('\t> Created ' + self.configuration.language_string + ' \'./.gitignore\'')
 
-            # Add executable name to .gitignore for non-Python projects
-            if not self.configuration.language == Language.python:
-                with open(directory + '/.gitignore', 'a') as gi:
-                    gi.write('\n# Actual binary\n')
-                    gi.write(file_namer.name)
+            generated += [directory + '/README.md', directory + '/.gitignore']
+
+            # Everything Rocket generated goes into the initial commit, as `git add .` would
+            committed = files + shipped + [directory + '/config.json', directory + '/README.md', directory + '/.gitignore']
+            if manifest is not None:
+                committed += [os.path.join(directory, key) for key in manifest]
+            elif os.path.exists(directory + '/makefile'):
+                committed.append(directory + '/makefile')
+            committed = [f for f in committed if os.path.isfile(f)]
+
+            # Initialize the repository, set `origin` and push
+            if git:
+                with rocket.profiler.Record('git'):
+                    if self.configuration.git_native:
+                        self.GitNative(directory, committed)
+                    else:
+                        self.GitSubprocess(directory)
+
+        elif self.configuration.git_remote:
+            print('\t! Error: You specified to add a git remote but NOT to create a git repo...')
+
+        if not self.configuration.git_remote and self.configuration.git_push:
+            print('\t* Warning: You configured to \'push\' the git repo but you did not provide a valid repo...')
+
+        if manifest is not None:
+            for f in generated:
+                if state.Key(f) not in manifest:
+                    state.Created(f)
+            state.Save(self.writer)
+
+        with rocket.profiler.Record('sync'):
+            self.writer.Sync()
+
+    def Watch(self, directory=None, jobs=1, pool='thread', poll=False):
+        """
+        Configure the project in `directory` (default: the current directory),
+        then configure it again whenever its `config.json` changes, until interrupted
+
+        Everything stays loaded in between: templates are not parsed again,
+        and only files whose values changed are rendered again. The language's
+        files are not watched: projects are rendered from the templates kept
+        in their state file. The `git` repository is only set up by the first run.
+        """
+        import rocket.watcher
+
+        if directory is None:
+            directory = os.getcwd()
+
+        paths = [(directory, ['config.json'])]
+
+        def Changed():
+            print('\n>>> Configuring the project again >>>')
+
+            try:
+                self.Config(directory, jobs, pool, git=False)
+            except Exception as e:
+                print('\t! Error: ' + str(e))
+                return paths
+
+            print('<<< Configured \'' + self.configuration.project + '\' <<<')
+            return paths
+
+        self.Config(directory, jobs, pool)
+
+        print('\t> Watching \'config.json\' for changes (Ctrl-C to stop)')
+        rocket.watcher.Watch(paths, Changed, poll)
+
+    def Serve(self, path):
+        """
+        Run the `rocket serve` daemon on the Unix socket `path`, with the
+        language registry and every skeleton template loaded once, up front
+        """
+        import rocket.server
+
+        registry = self.Registry()
+        for entry in registry.languages.values():
+            sources = tuple(entry.configuration.sources)
+            for f in entry.skeleton:
+                if f.endswith(sources):
+                    with open(os.path.join(entry.directory, 'skeleton', f), encoding='utf-8') as skeleton_file:
+                        self.cache.Template(skeleton_file.read())
+
+        def handler(method, params):
+            builder = Rocket(params.get('sync', 'off'), self.dir)
+            builder.cache = self.cache
+            builder.registry = registry.Load()
+            return Request(builder, method, params)
+
+        rocket.server.Server(path, handler).Serve()
+
+    def Run(self, command, directory, stderr=None):
+        """
+        Run a command (a shell string or an argument list) in `directory` and
+        return its output, recorded as its own profiling phase
+        """
+        import subprocess
+        import rocket.profiler
+
+        with rocket.profiler.Record(command if isinstance(command, str) else ' '.join(command)):
+            rocket.profiler.Subprocess()
+            return subprocess.check_output(command, stderr=stderr, shell=isinstance(command, str), universal_newlines=True, cwd=directory)
+
+    def GitNative(self, directory, files):
+        """
+        Create the `git` repository, remote and initial commit directly, only
+        running `git` itself to push
+        """
+        import subprocess
+        import rocket.git
+
+        repository = rocket.git.Repository(directory)
+        print('\t> ' + repository.Init(), end='')
+
+        if not self.configuration.git_remote:
+            return
+
+        try:
+            repository.AddRemote('origin', self.configuration.git_remote)
+        except Exception as e:
+            print('\t! Error adding remote: ' + str(e))
+            print('\t! Try running \'rm -rf .git/; rocket config\' to REMOVE ALL GIT FILES and re-configure')
+            return
+
+        print('\t> git remote origin: ' + self.configuration.git_remote)
+
+        if self.configuration.git_push:
+            # Initial commit, authored by the first project author
+            author = self.configuration.authors[0]
+            commit = repository.Commit(files, 'Initial commit', author['name'], author.get('email', ''))
+
+            # Push
+            try:
+                out = self.Run(['git', 'push', '-u', 'origin', repository.branch], directory, subprocess.STDOUT)
+                print('\t> ' + str(out).replace('\n', '\n\t  '), end='')
+                print('\n\t> Pushed initial commit ' + commit[:7])
+
+            except subprocess.CalledProcessError as e:
+                print('\t! Unable to push initial commit:\n\t  ' + e.output.replace('\n', '\n\t  '))
 
-            # Run `git init`
-            out = subprocess.check_output("git init", shell=True, universal_newlines=True)
-            print('\t> ' + str(out), end='')
+            except OSError as e:
+                print('\t! Unable to push initial commit: ' + str(e))
+
+    def GitSubprocess(self, directory):
+        """
+        Create the `git` repository, remote and initial commit by running `git` commands
+        """
+        import subprocess
+
+        # Run `git init`
+        out = self.Run("git init", directory)
+        print('\t> ' + str(out), end='')
 
         # Set `origin` and set to push refs
-        if self.configuration.git and self.configuration.git_remote:
+        if self.configuration.git_remote:
             try:
-                out = subprocess.check_output('git remote add origin ' + self.configuration.git_remote, stderr=subprocess.STDOUT, shell=True, universal_newlines=True)
+                out = self.Run('git remote add origin ' + self.configuration.git_remote, directory, subprocess.STDOUT)
 
                 try:
                     # Call this and discard output to ensure the remote was added properly
-                    subprocess.check_output('git remote show origin', stderr=subprocess.STDOUT, shell=True, universal_newlines=True)
+                    self.Run('git remote show origin', directory, subprocess.STDOUT)
 
                     # Use this output (it is much cleaner) for displaying remote name
-                    out = subprocess.check_output('git config --get remote.origin.url', shell=True, universal_newlines=True)
+                    out = self.Run('git config --get remote.origin.url', directory)
                     print('\t> git remote origin: ' + str(out), end='')
 
                     if self.configuration.git_push:
                         try:
                             # Add files
-                            subprocess.check_output('git add .', shell=True, universal_newlines=True)
+                            self.Run('git add .', directory)
 
                             # Initial commit
-                            subprocess.check_output('git commit -m \'Inital commit\'', shell=True, universal_newlines=True)
+                            self.Run('git commit -m \'Inital commit\'', directory)
 
                             # Push
-                            out = subprocess.check_output('git push -u origin master', stderr=subprocess.STDOUT, shell=True, universal_newlines=True)
+                            out = self.Run('git push -u origin master', directory, subprocess.STDOUT)
 
                             print('\t> ' + str(out).replace('\n', '\n\t  '), end='')
 
                             # Show commit object hash
-                            out = subprocess.check_output('git log --pretty=format:\'%h\' -n 1', shell=True, universal_newlines=True)
+                            out = self.Run('git log --pretty=format:\'%h\' -n 1', directory)
 
                             print('\n\t> Pushed initial commit ' + str(out).replace('\n', '...'))
 
@@ -236,22 +473,22 @@ class Rocket:
                 print('\t! Error adding remote: ' + e.output, end='')
                 print('\t! Try running \'rm -rf .git/; rocket config\' to REMOVE ALL GIT FILES and re-configure')
 
-        elif not self.configuration.git and self.configuration.git_remote:
-            print('\t! Error: You specified to add a git remote but NOT to create a git repo...')
-
-        elif not self.configuration.git_remote and self.configuration.git_push:
-            print('\t* Warning: You configured to \'push\' the git repo but you did not provide a valid repo...')
-
-    def Clean(self):
+    def Clean(self, directory=None, yes=False, dry_run=False, jobs=None):
         """
-        Remove generated project files in the current directory
+        Remove the files Rocket generated in the project `directory` (default:
+        the current directory), as listed in its manifest, and the build outputs
+
+        Asks first unless `yes` is set; `dry_run` only lists what would be
+        removed. Returns 1 if nothing was removed.
         """
-        directory = os.getcwd()
+        import rocket.cleaner
+        import rocket.configuration
+        import rocket.namer
+        import rocket.profiler
+        import rocket.state
 
-        # Make sure user knows exactly which directory they are in
-        response = input('Remove all project files in \'' + directory + '\'? [Y/n]: ')
-        if not response == 'Y':
-            return 1
+        if directory is None:
+            directory = os.getcwd()
 
         # Have at least *some* sanity check...
         if directory == self.dir:
@@ -263,26 +500,51 @@ class Rocket:
         elif directory == os.path.expanduser('~'):
             raise Exception('You do not really want to remove \'' + directory + '\', right...?')
 
-        # Can use the `config.json` to more intelligently remove files if it exists
+        # The binary is named after the project, if `config.json` is still readable
+        name = None
+        language_directory = None
         if os.path.exists(directory + '/config.json'):
             configuration = rocket.configuration.Configuration()
-            configuration.Decode(directory + '/config.json')
-            configuration.Print()
+            try:
+                configuration.Decode(directory + '/config.json', self.Registry())
+                name = rocket.namer.FileNamer(configuration, self.writer).Name()
+                language_directory = configuration.language_entry.directory
+            except Exception as e:
+                print('\t* Warning: Not removing the binary: ' + str(e))
+
+        # Only ever remove what Rocket itself made: no blind removal
+        state = rocket.state.State(directory, language_directory).Load()
+        manifest = state.Manifest()
+        if manifest is None:
+            raise Exception('No list of generated files in \'' + state.path + '\': Not a Rocket project, or created by an older Rocket')
+
+        targets = rocket.cleaner.Targets(directory, manifest, rocket.state.State.filename, name)
+        if not targets:
+            print('\t> Nothing to remove in \'' + directory + '\'')
+            return 1
 
-        # @TODO Add 'files' attribute to 'config.json' when generating as files are added and only use that! Do not do any blind removal
+        print('\t> ' + ('Would remove:' if dry_run else 'Removing:'))
+        for target in targets:
+            print('\t\t* ' + os.path.relpath(target, directory) + ('/' if os.path.isdir(target) and not os.path.islink(target) else ''))
 
-        # @TODO How to handle '.gitignore' and '.git/'?
+        if dry_run:
+            return 1
 
-        # Else do blind removal of *.py, config.json, makefile, .gitignore, ./.git/, ./src/, ./obj/, ./bin/, {Executable}, etc.
-        # else:
-        #     os.remove(glob(directory + '/*.py'))
-        #     os.remove(directory + '/config.json')
-        #     os.remove(directory + '/makefile')
-        #     os.remove(directory + '/.gitignore')
-        #     shutil.rmtree(directory + '/.git/')
-        #     shutil.rmtree(directory + '/src/')
-        #     shutil.rmtree(directory + '/obj/')
-        #     shutil.rmtree(directory + '/bin/')
+        # Make sure user knows exactly which directory they are in
+        if not yes:
+            if not sys.stdin.isatty():
+                raise Exception('Not asking for confirmation without a terminal: Run \'rocket clean --yes\' to remove the files')
+
+            response = input('Remove these files in \'' + directory + '\'? [Y/n]: ')
+            if not response == 'Y':
+                return 1
+
+        with rocket.profiler.Record('remove'):
+            files, directories = rocket.cleaner.Remove(targets, jobs)
+            directories += rocket.cleaner.Prune(directory, manifest)
+
+        # `.git/` holds the user's history: never removed
+        print('\t> Removed ' + str(files) + ' file(s) and ' + str(directories) + ' directories')
 
         return 0
 
@@ -292,6 +554,99 @@ class Rocket:
         """
         self.configuration.Print()
 
+def CreateProject(line, spec, sync='off'):
+    """
+    Batch worker: create and configure a single project from a manifest spec
+
+    The language and the resulting `config.json` are checked before anything
+    is written. A project that fails is removed again (the directory too, if
+    it was made here), so the same manifest can simply be run again.
+    """
+    import io
+    import shutil
+    import contextlib
+    import rocket.batch
+    import rocket.configuration
+    import rocket.generator
+
+    directory = spec['directory']
+    overrides = {key: value for key, value in spec.items() if key not in ('project', 'language', 'directory')}
+
+    try:
+        if os.path.exists(directory) and os.listdir(directory):
+            raise Exception('Directory \'' + directory + '\' is not empty')
+
+        builder = Rocket(sync)
+        config = rocket.generator.Generator(builder.dir, builder.Registry()).Config(spec['language'], spec['project'], overrides)
+        errors = rocket.configuration.ConfigSchema.Validate(config)
+        if errors:
+            raise rocket.configuration.Invalid('project', errors)
+
+    except Exception as e:
+        return rocket.batch.BatchResult(line, spec['project'], directory, str(e))
+
+    created = not os.path.exists(directory)
+    warnings = []
+
+    try:
+        os.makedirs(directory, exist_ok=True)
+
+        # Keep per-project output from interleaving between workers
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            builder.Create(spec['language'], spec['project'], directory, overrides)
+            builder.Config(directory)
+
+        # Failures Rocket reports without raising (e.g. a git push that could not be made)
+        errors, warnings = rocket.batch.Problems(output.getvalue())
+        if errors:
+            raise Exception('; '.join(errors))
+
+    except Exception as e:
+        if created:
+            shutil.rmtree(directory, ignore_errors=True)
+        elif os.path.isdir(directory):
+            for name in os.listdir(directory):
+                path = os.path.join(directory, name)
+                if os.path.isdir(path) and not os.path.islink(path):
+                    shutil.rmtree(path, ignore_errors=True)
+                else:
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+
+        return rocket.batch.BatchResult(line, spec['project'], directory, str(e), warnings)
+
+    return rocket.batch.BatchResult(line, spec['project'], directory, None, warnings)
+
+def Request(builder, method, params):
+    """
+    Run a `create` or `config` request with a `Rocket` object and return its result
+    """
+    if method == 'create':
+        builder.Create(params['language'], params['project'], params['directory'], params.get('overrides'), params.get('link', False))
+        return {}
+
+    builder.Config(params['directory'], params.get('jobs', 1), params.get('pool', 'thread'))
+    return {'project': builder.configuration.project}
+
+def Execute(method, params):
+    """
+    Run a request in the `rocket serve` daemon if one is listening, otherwise in this process
+    """
+    # Profiles are only taken in this process
+    if not args.no_daemon and not args.profile and not args.trace:
+        import rocket.client
+
+        with rocket.client.Client(args.socket) as client:
+            if client.Connect():
+                result = client.Call(method, params)
+                print(result.pop('output'), end='')
+                return result
+
+    return Request(Rocket(params['sync']), method, params)
+
 def main():
     """
     Rocket main
@@ -308,13 +663,70 @@ def main():
 
     # Execute command
     if args.command == 'clean':
-        directory = os.getcwd()
         print('\n>>> Removing existing project files >>>')
-        rocket = Rocket()
-        if not rocket.Clean():
+        rocket = Rocket(args.fsync)
+        if not rocket.Clean(os.getcwd(), args.yes, args.dry_run, args.jobs):
             print('<<< Project files removed <<<\n')
 
+    elif args.command == 'create' and args.batch:
+        import functools
+        from rocket.batch import Batch
+
+        print('\n>>> Creating projects from \'' + args.batch + '\' >>>')
+        batch = Batch(functools.partial(CreateProject, sync=args.fsync), args.jobs)
+        failures = batch.Report(batch.Run(args.batch))
+        if failures:
+            raise Exception(str(failures) + ' project(s) could not be created')
+        print('<<< Created all projects <<<\n')
+
+    elif args.command == 'create' and args.archive:
+        from rocket.archive import Archive, Format
+        from rocket.generator import Generator
+
+        if not args.project or not args.language:
+            raise Exception('Must specify a project name and language to create an archive')
+
+        print('\n>>> Creating a ' + args.language + ' project named \'' + args.project + '\' in an archive >>>')
+
+        builder = Rocket(args.fsync)
+        generator = Generator(builder.dir, builder.Registry())
+        config = generator.Config(args.language, args.project)
+
+        # Messages already go to stderr when the archive is written to stdout
+        if args.archive == '-':
+            out_file = sys.__stdout__.buffer
+            pending = None
+        else:
+            pending = builder.writer.Open(args.archive)
+            out_file = pending.temp_file
+
+        try:
+            with Archive(out_file, args.format or Format(args.archive), args.project) as archive:
+                for path, content, mode in generator.Files(config):
+                    archive.Add(path, content, mode)
+                    print('\t> Added ' + path)
+        except BaseException:
+            if pending:
+                pending.Discard()
+            raise
+
+        if pending:
+            pending.Commit()
+            builder.writer.Sync()
+        else:
+            out_file.flush()
+
+        print('<<< Created \'' + args.project + '\' in ' + ('stdout' if args.archive == '-' else '\'' + args.archive + '\'') + ' <<<\n')
+
     elif args.command == 'create':
+        if not args.project or not args.language:
+            raise Exception('Must specify a project name and language, or a manifest with \'--batch MANIFEST\'')
+
+        # Checked before the project directory is made
+        registry = Rocket(args.fsync).Registry()
+        if registry.Find(args.language) is None:
+            raise Exception('Unknown language \'' + args.language + '\': Must be one of ' + ', '.join(registry.Names()))
+
         print('\n>>> Creating a blank ' + args.language + ' project named \'' + args.project + '\' >>>')
 
         path, dirname = os.path.split(os.getcwd())
@@ -333,16 +745,37 @@ def main():
             os.chdir(args.project)
             print('\t> Created project directory: \'' + os.path.dirname(os.getcwd() + '/') + '\'')
 
-        rocket = Rocket()
-        rocket.Create(args.language, args.project)
+        Execute('create', {'language': args.language, 'project': args.project, 'directory': os.getcwd(), 'link': args.link, 'sync': args.fsync})
         print('<<< Created skeleton ' + args.language + ' project <<<')
         print('<<< Edit the \'config.json\' file with your project settings and run \'rocket config\' to finish <<<\n')
 
+    elif args.command == 'config' and args.watch:
+        print('\n>>> Configuring the project >>>')
+        try:
+            Rocket(args.fsync).Watch(os.getcwd(), args.jobs, args.pool, args.poll)
+        except KeyboardInterrupt:
+            print('\n<<< Stopped watching <<<\n')
+
     elif args.command == 'config':
-        rocket = Rocket()
         print('\n>>> Configuring the project >>>')
-        rocket.Config()
-        print('<<< Configured \'' + rocket.configuration.project + '\' <<<\n')
+        result = Execute('config', {'directory': os.getcwd(), 'jobs': args.jobs, 'pool': args.pool, 'sync': args.fsync})
+        print('<<< Configured \'' + result['project'] + '\' <<<\n')
+
+    elif args.command == 'serve':
+        from rocket.client import Client, DefaultSocket
+
+        path = args.socket or DefaultSocket()
+
+        if args.stop:
+            with Client(path) as client:
+                if not client.Connect():
+                    raise Exception('No rocket daemon is listening on \'' + path + '\'')
+                client.Call('shutdown')
+            print('\t> Stopped the daemon on ' + path)
+
+        else:
+            print('\n>>> Serving create/config requests >>>')
+            Rocket(args.fsync).Serve(path)
 
     else:
         raise Exception('Must specify language with \'-l LANGUAGE\' or run config with \'-c\' or \'--config\'')
@@ -355,21 +788,52 @@ if __name__ == '__main__':
 
         # Options
         parser.add_argument('-v', '--verbose', action='store_true', default=False, help='verbose mode')
+        parser.add_argument('--profile', action='store_true', default=False, help='print the time and I/O of each phase')
+        parser.add_argument('--trace', metavar='FILE', help='write a Chrome trace (JSON) of each phase to FILE')
+        parser.add_argument('--socket', metavar='PATH', help='socket of the \'rocket serve\' daemon (default: $ROCKET_SOCKET, or rocket-<uid>.sock in $XDG_RUNTIME_DIR or /tmp)')
+        parser.add_argument('--no-daemon', action='store_true', default=False, help='always run in this process, even if a daemon is listening')
+        parser.add_argument('--fsync', choices=SyncModes, default='off', help='fsync generated files: never, after each file, or once per project')
 
         # Commands
         subparsers = parser.add_subparsers(help='commands:', dest='command')
 
         create_parser = subparsers.add_parser('create', help='create a new project')
-        create_parser.add_argument('project', help='project name')
-        create_parser.add_argument('language', type=str.lower, help='project language', choices=['c', 'c++', 'cpp', 'python'])
+        create_parser.add_argument('project', nargs='?', help='project name')
+        create_parser.add_argument('language', nargs='?', type=str.lower, help='project language (any directory in \'languages/\', e.g. c, c++, python)')
+        create_parser.add_argument('-b', '--batch', metavar='MANIFEST', help='create every project listed in a JSON-lines manifest')
+        create_parser.add_argument('-a', '--archive', metavar='FILE', help='write the created and configured project into a tar/zip archive instead (\'-\' for stdout)')
+        create_parser.add_argument('--format', choices=['tar', 'tar.gz', 'tar.zst', 'zip'], help='archive format (default: from the FILE suffix, otherwise tar)')
+        create_parser.add_argument('--link', action='store_true', default=False, help='hardlink skeleton files that are never templated instead of copying them')
+        create_parser.add_argument('-j', '--jobs', type=Jobs, default=None, help='number of worker processes for \'--batch\' (default, 0: number of CPUs)')
 
         config_parser = subparsers.add_parser('config', help='configure a project')
+        config_parser.add_argument('-j', '--jobs', type=Jobs, default=1, help='number of source files rendered at once (default: 1, 0: number of CPUs)')
+        config_parser.add_argument('--pool', choices=['thread', 'process'], default='thread', help='render with threads (I/O-bound, e.g. NFS) or processes (CPU-heavy templates)')
+        config_parser.add_argument('-w', '--watch', action='store_true', default=False, help='stay running and configure again whenever \'config.json\' changes')
+        config_parser.add_argument('--poll', action='store_true', default=False, help='with \'--watch\', poll for changes instead of using inotify (e.g. on network filesystems)')
 
         clean_parser  = subparsers.add_parser('clean', help='remove all project files')
+        clean_parser.add_argument('-y', '--yes', action='store_true', default=False, help='do not ask for confirmation (needed without a terminal)')
+        clean_parser.add_argument('-n', '--dry-run', action='store_true', default=False, help='only list what would be removed')
+        clean_parser.add_argument('-j', '--jobs', type=Jobs, default=None, help='number of files removed at once (default, 0: CPUs + 4, at most 32)')
+
+        serve_parser = subparsers.add_parser('serve', help='keep Rocket loaded and run create/config requests from a Unix socket')
+        serve_parser.add_argument('--stop', action='store_true', default=False, help='stop the running daemon')
 
         args = parser.parse_args()
 
+        # Keep stdout for the archive
+        if getattr(args, 'archive', None) == '-':
+            sys.stdout = sys.stderr
+
+        if args.profile or args.trace:
+            import rocket.profiler
+            rocket.profiler.Current.Enable()
+
         main()
+
+        if args.profile: rocket.profiler.Current.Summary()
+        if args.trace: rocket.profiler.Current.Trace(args.trace)
         if args.verbose: print('\n' + time.asctime())
         if args.verbose: print('Total Runtime: ', end='')
         if args.verbose: print(str((time.time() - start_time) * 1000) + ' ms')
@@ -382,6 +846,7 @@ if __name__ == '__main__':
         print('\n<-- Exception: ', end='')
         print(str(e), end=' -->\n\n')
         if(args.verbose):
+            import traceback
             traceback.print_exc()
 
         os._exit(1)
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+
+#   Rocket - Archive
+#
+#   Joe Gibson (gibsjose@mail.gvsu.edu)
+#
+#   17 August 2015
+#
+#   http://gibsjose.com
+#   http://github.com/gibsjose/Rocket
+
+# Essential Modules
+import io
+import stat
+import time
+import tarfile
+import zipfile
+
+# Archive formats
+#   - 'tar': Uncompressed tar
+#   - 'tar.gz': gzip-compressed tar
+#   - 'tar.zst': zstd-compressed tar (needs Python 3.14's `compression.zstd` or the `zstandard` module)
+#   - 'zip': Deflate-compressed zip
+Formats = ['tar', 'tar.gz', 'tar.zst', 'zip']
+
+# File name suffixes of each format
+Suffixes = [('.tar.gz', 'tar.gz'), ('.tgz', 'tar.gz'), ('.tar.zst', 'tar.zst'), ('.tzst', 'tar.zst'), ('.zip', 'zip'), ('.tar', 'tar')]
+
+# Permissions of the directories in an archive
+DirectoryMode = 0o755
+
+def Format(filepath):
+    """
+    Archive format for a file name, from its suffix (default: 'tar')
+    """
+    for suffix, archive_format in Suffixes:
+        if filepath.endswith(suffix):
+            return archive_format
+
+    return 'tar'
+
+def Compressor(out_file):
+    """
+    Writable zstd stream on top of `out_file`
+    """
+    try:
+        from compression import zstd
+        return zstd.ZstdFile(out_file, 'w')
+    except ImportError:
+        pass
+
+    try:
+        import zstandard
+    except ImportError:
+        raise Exception('\'tar.zst\' archives need the \'zstandard\' module (pip install zstandard)')
+
+    return zstandard.ZstdCompressor().stream_writer(out_file, closefd=False)
+
+class Archive:
+    """
+    Writes generated files into a tar or zip stream as they are produced,
+    under a single top-level directory; the output only needs to be
+    writable, not seekable, so it can be a pipe (e.g. stdout)
+    """
+    def __init__(self, out_file, archive_format, root):
+        """
+        Sets the binary output file, the format (see `Formats`) and the top-level directory
+        """
+        if archive_format not in Formats:
+            raise Exception('Unknown archive format \'' + str(archive_format) + '\': Must be one of ' + ', '.join(Formats))
+
+        self.format = archive_format
+        self.root = root.strip('/')
+        self.mtime = time.time()
+        self.directories = set()
+        self.compressor = None
+
+        if archive_format == 'zip':
+            self.archive = zipfile.ZipFile(out_file, 'w', zipfile.ZIP_DEFLATED)
+        elif archive_format == 'tar.zst':
+            self.compressor = Compressor(out_file)
+            self.archive = tarfile.open(fileobj=self.compressor, mode='w|', format=tarfile.PAX_FORMAT)
+        elif archive_format == 'tar.gz':
+            self.archive = tarfile.open(fileobj=out_file, mode='w|gz', format=tarfile.PAX_FORMAT)
+        else:
+            self.archive = tarfile.open(fileobj=out_file, mode='w|', format=tarfile.PAX_FORMAT)
+
+        self.Directory(self.root)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.Close()
+        return False
+
+    def Directory(self, path):
+        """
+        Add a directory entry (once), after its parents
+        """
+        if not path or path in self.directories:
+            return
+
+        parent = path.rpartition('/')[0]
+        self.Directory(parent)
+        self.directories.add(path)
+
+        if self.format == 'zip':
+            info = zipfile.ZipInfo(path + '/', time.localtime(self.mtime)[:6])
+            info.external_attr = (stat.S_IFDIR | DirectoryMode) << 16
+            self.archive.writestr(info, b'')
+        else:
+            info = tarfile.TarInfo(path)
+            info.type = tarfile.DIRTYPE
+            info.mode = DirectoryMode
+            info.mtime = self.mtime
+            self.archive.addfile(info)
+
+    def Add(self, path, content, mode):
+        """
+        Add a file (path relative to the top-level directory, contents as bytes, permissions)
+        """
+        path = '/'.join(part for part in [self.root, path.replace('\\', '/')] if part)
+        self.Directory(path.rpartition('/')[0])
+
+        if self.format == 'zip':
+            info = zipfile.ZipInfo(path, time.localtime(self.mtime)[:6])
+            info.external_attr = (stat.S_IFREG | mode) << 16
+            info.compress_type = zipfile.ZIP_DEFLATED
+            self.archive.writestr(info, content)
+        else:
+            info = tarfile.TarInfo(path)
+            info.size = len(content)
+            info.mode = mode
+            info.mtime = self.mtime
+            self.archive.addfile(info, io.BytesIO(content))
+
+    def Close(self):
+        """
+        Finish the archive (the output file itself is left open)
+        """
+        self.archive.close()
+        if self.compressor is not None:
+            self.compressor.close()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+
+#   Rocket - Batch
+#
+#   Joe Gibson (gibsjose@mail.gvsu.edu)
+#
+#   17 August 2015
+#
+#   http://gibsjose.com
+#   http://github.com/gibsjose/Rocket
+
+# Essential Modules
+import os
+import concurrent.futures
+
+# Other Modules
+import json         # JSON
+
+# Local Modules
+import rocket.naming
+
+# Number of manifest lines whose project names are checked at once
+NameWindow = 256
+
+def Problems(output):
+    """
+    `(errors, warnings)` printed by a `create` + `config` run: the messages of
+    its `!` and `* Warning` lines, with the indented lines following an error
+    (e.g. `git` output)
+    """
+    errors = []
+    warnings = []
+    error = False
+
+    for line in output.splitlines():
+        message = line.strip()
+        if message.startswith('!'):
+            errors.append(message[1:].strip())
+            error = True
+        elif error and line.startswith('\t  ') and message:
+            errors[-1] += ' ' + message
+        else:
+            error = False
+            if message.startswith('* Warning'):
+                warnings.append(message[len('* Warning'):].lstrip(':').strip())
+
+    return errors, warnings
+
+class BatchResult:
+    """
+    Outcome of generating a single project from a manifest line
+    """
+    def __init__(self, line, project, directory, error=None, warnings=None):
+        """
+        Sets the manifest line number, project name, destination, error message
+        (if any) and warnings
+        """
+        self.line = line
+        self.project = project
+        self.directory = directory
+        self.error = error
+        self.warnings = warnings or []
+
+class Batch:
+    """
+    Generates many projects from a JSON-lines manifest across a pool of worker processes
+
+    Each manifest line is a JSON object with a `project` and `language`, an
+    optional `directory` (default: the project name, relative to the current
+    directory), and any other `config.json` attributes (e.g. `authors`,
+    `websites`, `git`, `git-remote`, `git-push`) to use for that project.
+    """
+    def __init__(self, worker, jobs=None):
+        """
+        Sets the worker function, called as `worker(line, spec)` in a child process, and the number of processes
+        (None or 0: number of CPUs)
+        """
+        if jobs is not None and jobs < 0:
+            raise Exception('Invalid number of jobs \'' + str(jobs) + '\': Must be 0 (number of CPUs) or more')
+
+        self.worker = worker
+        self.jobs = jobs or os.cpu_count() or 1
+
+    def Specs(self, filepath):
+        """
+        Stream `(line, spec)` pairs from the manifest, with `spec` set to an error message for invalid lines
+        """
+        with open(filepath, encoding='utf-8') as manifest:
+            for number, line in enumerate(manifest, 1):
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+
+                try:
+                    spec = json.loads(line)
+                except ValueError as e:
+                    yield number, 'Invalid JSON: ' + str(e)
+                    continue
+
+                if not isinstance(spec, dict) or 'project' not in spec or 'language' not in spec:
+                    yield number, 'Must specify \'project\' and \'language\''
+                    continue
+
+                if not isinstance(spec['project'], str):
+                    yield number, '\'project\' must be a string'
+                    continue
+
+                # Resolve relative to where `rocket` was run, not where the worker happens to be
+                spec['directory'] = os.path.abspath(spec.get('directory', spec['project']))
+
+                yield number, spec
+
+    def Named(self, specs):
+        """
+        `(line, spec)` pairs with specs whose project name cannot name any
+        files (no letters or digits) turned into error messages, so they fail
+        before a worker starts; names are converted `NameWindow` lines at a time
+        """
+        window = []
+        for pair in specs:
+            window.append(pair)
+            if len(window) >= NameWindow:
+                yield from self.CheckNames(window)
+                window = []
+
+        yield from self.CheckNames(window)
+
+    def CheckNames(self, window):
+        """
+        Check the project names of a list of `(line, spec)` pairs at once (see `Named`)
+        """
+        named = [(number, spec) for number, spec in window if not isinstance(spec, str)]
+        names = rocket.naming.ConvertAll([spec['project'] for number, spec in named], 'underscores')
+        unnamed = set(number for (number, spec), name in zip(named, names) if name is None)
+
+        for number, spec in window:
+            if number in unnamed:
+                yield number, 'Cannot name files after \'' + spec['project'] + '\': It has no letters or digits'
+            else:
+                yield number, spec
+
+    def Run(self, filepath):
+        """
+        Generate every project in the manifest, returning a list of `BatchResult` in manifest order
+        """
+        results = []
+
+        if self.jobs == 1:
+            for number, spec in self.Named(self.Specs(filepath)):
+                if isinstance(spec, str):
+                    results.append(BatchResult(number, None, None, spec))
+                else:
+                    results.append(self.worker(number, spec))
+            return results
+
+        # Keep a bounded number of specs in flight so huge manifests are streamed, not loaded
+        limit = self.jobs * 4
+        pending = set()
+
+        with concurrent.futures.ProcessPoolExecutor(max_workers=self.jobs) as executor:
+            for number, spec in self.Named(self.Specs(filepath)):
+                if isinstance(spec, str):
+                    results.append(BatchResult(number, None, None, spec))
+                    continue
+
+                if len(pending) >= limit:
+                    done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                    results.extend(future.result() for future in done)
+
+                pending.add(executor.submit(self.worker, number, spec))
+
+            for future in concurrent.futures.as_completed(pending):
+                results.append(future.result())
+
+        results.sort(key=lambda result: result.line)
+
+        return results
+
+    def Report(self, results):
+        """
+        Print a per-project summary and return the number of failures
+        """
+        failures = 0
+
+        for result in results:
+            if result.error is None:
+                print('\t> Created \'' + result.project + '\' in ' + result.directory)
+                for warning in result.warnings:
+                    print('\t* Warning: \'' + result.project + '\': ' + warning)
+            else:
+                failures += 1
+                name = '\'' + result.project + '\'' if result.project else 'line ' + str(result.line)
+                print('\t! Failed ' + name + ': ' + result.error)
+
+        print('\t> ' + str(len(results) - failures) + ' created, ' + str(failures) + ' failed')
+
+        return failures
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+
+#   Rocket - Bytecode
+#
+#   Joe Gibson (gibsjose@mail.gvsu.edu)
+#
+#   17 August 2015
+#
+#   http://gibsjose.com
+#   http://github.com/gibsjose/Rocket
+
+# Essential Modules
+import io
+import stat
+import marshal
+import zipfile
+import importlib.util
+import py_compile
+
+# Interpreter line of generated zipapps
+Interpreter = '/usr/bin/env python3'
+
+# Permissions of generated zipapps
+ZipappMode = stat.S_IRWXU
+
+# Timestamp of every zipapp member, so unchanged scripts give identical archives
+ZipTime = (1980, 1, 1, 0, 0, 0)
+
+def Compile(filepaths):
+    """
+    Write the cached bytecode (`__pycache__/*.pyc`) of Python files, so they
+    are not compiled the first time they are imported; returns the paths of
+    the bytecode files written
+
+    Scripts run directly (`./script.py`) are always compiled by Python: this
+    only helps modules they import, and `python -m`.
+    """
+    compiled = []
+    for filepath in filepaths:
+        compiled.append(py_compile.compile(filepath, doraise=True))
+
+    return compiled
+
+def Zipapp(source, filename='__main__.py'):
+    """
+    Contents of an executable zipapp (`.pyz`) running the Python `source`,
+    as bytes
+
+    The archive holds the script's bytecode next to its source, so Python
+    runs it without compiling it first. The bytecode does not depend on the
+    source's mtime, and is skipped in favour of the source by any other
+    Python version.
+    """
+    if isinstance(source, str):
+        source = source.encode('utf-8')
+
+    # Unchecked hash-based .pyc (PEP 552): magic, flags, source hash, code
+    code = compile(source, filename, 'exec', dont_inherit=True)
+    pyc = importlib.util.MAGIC_NUMBER + (1).to_bytes(4, 'little') + importlib.util.source_hash(source) + marshal.dumps(code)
+
+    archive = io.BytesIO()
+    archive.write(('#!' + Interpreter + '\n').encode('utf-8'))
+
+    with zipfile.ZipFile(archive, 'w', zipfile.ZIP_STORED) as zip_file:
+        for name, content in [('__main__.py', source), ('__main__.pyc', pyc)]:
+            info = zipfile.ZipInfo(name, ZipTime)
+            info.external_attr = (stat.S_IFREG | 0o644) << 16
+            zip_file.writestr(info, content)
+
+    return archive.getvalue()
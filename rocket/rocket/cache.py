@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+
+#   Rocket - Cache
+#
+#   Joe Gibson (gibsjose@mail.gvsu.edu)
+#
+#   17 August 2015
+#
+#   http://gibsjose.com
+#   http://github.com/gibsjose/Rocket
+
+# Essential Modules
+import os
+import hashlib
+import pickle
+
+# Local Modules
+import rocket.template
+import rocket.writer
+
+class Cache:
+    """
+    Persistent on-disk cache of parsed skeletons and decoded language files
+
+    Entries are pickled into one file each and replaced atomically, so any
+    number of `rocket` processes can share the same cache directory. Reads
+    that fail for any reason are treated as misses. Entries are also kept in
+    memory, so a long-lived process (`rocket serve`) reads each one only once.
+    """
+    # Bump whenever the layout of cached values changes
+    version = 1
+
+    def __init__(self, r_dir):
+        """
+        Uses `$XDG_CACHE_HOME/rocket` if set, otherwise `.cache/` in the Rocket directory
+        """
+        if os.environ.get('XDG_CACHE_HOME'):
+            root = os.path.join(os.environ['XDG_CACHE_HOME'], 'rocket')
+        else:
+            root = os.path.join(r_dir, '.cache')
+
+        self.directory = os.path.join(root, 'v' + str(self.version))
+        self.enabled = True
+        self.writer = rocket.writer.FileWriter()
+        self.memory = {}
+
+    def Path(self, kind, key):
+        """
+        Path of the entry for `key` in the `kind` bucket
+        """
+        return os.path.join(self.directory, kind, key + '.pickle')
+
+    def Read(self, path):
+        """
+        Read an entry, returning None if it is missing or unreadable
+        """
+        if path in self.memory:
+            return self.memory[path]
+
+        if not self.enabled:
+            return None
+
+        try:
+            with open(path, 'rb') as entry_file:
+                entry = pickle.load(entry_file)
+        except Exception:
+            return None
+
+        self.memory[path] = entry
+        return entry
+
+    def Write(self, path, entry):
+        """
+        Atomically write an entry; the cache disables itself if the directory is not writable
+        """
+        self.memory[path] = entry
+
+        if not self.enabled:
+            return
+
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self.writer.Write(path, pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL))
+        except OSError:
+            self.enabled = False
+
+    def Template(self, text):
+        """
+        Parsed `Template` for the given skeleton text, keyed by content hash
+        """
+        digest = hashlib.sha1(text.encode('utf-8')).hexdigest()
+        path = self.Path('templates', digest)
+
+        template = rocket.template.Template()
+
+        segments = self.Read(path)
+        if segments is not None:
+            template.segments = segments
+            return template
+
+        template.Parse(text)
+        self.Write(path, template.segments)
+
+        return template
+
+    def Kept(self, digest):
+        """
+        Path of the kept copy of a file whose contents hash to `digest`, or None
+        """
+        path = os.path.join(self.directory, 'sources', digest)
+        if self.enabled and os.path.exists(path):
+            return path
+
+        return None
+
+    def Keep(self, digest, filepath):
+        """
+        Atomically keep a copy of the file at `filepath` (e.g. a large template)
+        under its hash `digest`; the cache disables itself if the directory is
+        not writable
+        """
+        if not self.enabled or self.Kept(digest):
+            return
+
+        path = os.path.join(self.directory, 'sources', digest)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            pending = self.writer.Open(path)
+            try:
+                with open(filepath, 'rb') as in_file:
+                    for chunk in iter(lambda: in_file.read(1 << 20), b''):
+                        pending.Write(chunk)
+            except BaseException:
+                pending.Discard()
+                raise
+            pending.Commit()
+        except OSError:
+            self.enabled = False
+
+    def Load(self, kind, key, signature, build):
+        """
+        Value built by `build()`, cached under `key` for as long as `signature` is unchanged
+        """
+        path = self.Path(kind, hashlib.sha1(key.encode('utf-8')).hexdigest())
+
+        entry = self.Read(path)
+        if entry is not None and entry['signature'] == signature:
+            return entry['value']
+
+        value = build()
+        self.Write(path, {'signature': signature, 'value': value})
+
+        return value
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+
+#   Rocket - Cleaner
+#
+#   Joe Gibson (gibsjose@mail.gvsu.edu)
+#
+#   17 August 2015
+#
+#   http://gibsjose.com
+#   http://github.com/gibsjose/Rocket
+
+# Essential Modules
+import os
+import concurrent.futures
+
+# Build output directories of the language makefiles, relative to the project
+BuildDirectories = ['build', 'bin', 'obj']
+
+def Inside(directory, path):
+    """
+    Whether the relative `path` stays inside `directory` (no absolute paths,
+    no `..`, not the directory itself and no links out of it)
+    """
+    if os.path.isabs(path) or os.path.normpath(path) == '.' or '..' in path.replace('\\', '/').split('/'):
+        return False
+
+    root = os.path.realpath(directory)
+    parent = os.path.realpath(os.path.dirname(os.path.join(directory, path)))
+
+    return parent == root or parent.startswith(os.path.join(root, ''))
+
+def Targets(directory, manifest, state=None, name=None):
+    """
+    Paths `rocket clean` removes from the project `directory`, sorted: the
+    files in the `manifest` (relative paths), the `state` file, and for
+    projects built with a makefile (one is in the manifest) the build
+    output directories and the binary `name` (a file or link in the
+    project directory), if they exist
+
+    Raises an exception if the manifest lists a path outside the project.
+    """
+    paths = list(manifest)
+    for path in paths:
+        if not Inside(directory, path):
+            raise Exception('Not removing \'' + path + '\': Outside the project directory')
+
+    if state:
+        paths.append(state)
+
+    makefile = 'makefile' in manifest
+    if makefile:
+        paths += BuildDirectories
+
+    targets = set()
+    for path in paths:
+        filepath = os.path.join(directory, path)
+        if os.path.lexists(filepath):
+            targets.add(filepath)
+
+    if makefile and name:
+        binary = os.path.join(directory, name)
+        if os.path.islink(binary) or os.path.isfile(binary):
+            targets.add(binary)
+
+    return sorted(targets)
+
+def Walk(paths):
+    """
+    Every file (including links) and directory under `paths`, as `(files,
+    directories)`, in a single `os.scandir` pass; links to directories are
+    files, never followed
+    """
+    files = []
+    directories = []
+    stack = []
+
+    for path in paths:
+        if os.path.isdir(path) and not os.path.islink(path):
+            stack.append(path)
+        else:
+            files.append(path)
+
+    while stack:
+        path = stack.pop()
+        directories.append(path)
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                else:
+                    files.append(entry.path)
+
+    return files, directories
+
+def Unlink(path):
+    """
+    Remove a file, returning an error message or None
+    """
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        return path + ': ' + e.strerror
+
+    return None
+
+def RemoveDirectory(path):
+    """
+    Remove an empty directory, returning an error message or None
+    """
+    try:
+        os.rmdir(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        return path + ': ' + e.strerror
+
+    return None
+
+def Remove(paths, jobs=None):
+    """
+    Remove files and whole directory trees; returns `(files, directories)`,
+    the number of each removed
+
+    Every file is unlinked at once across a pool of threads (each unlink is
+    a round trip on network storage), then the directories are removed
+    deepest first, one level at a time. Nothing stops at the first error:
+    every failure is printed, then an exception is raised. `jobs` of None or
+    0 uses the thread pool's default size.
+    """
+    if jobs is not None and jobs < 0:
+        raise Exception('Invalid number of jobs \'' + str(jobs) + '\': Must be 0 (default) or more')
+
+    files, directories = Walk(paths)
+
+    # Deepest directories first: a level is only removed once everything below it is gone
+    levels = {}
+    for path in directories:
+        levels.setdefault(path.count(os.sep), []).append(path)
+
+    errors = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=jobs or None) as executor:
+        errors.extend(executor.map(Unlink, files))
+        for depth in sorted(levels, reverse=True):
+            errors.extend(executor.map(RemoveDirectory, levels[depth]))
+
+    errors = [error for error in errors if error is not None]
+    for error in errors:
+        print('\t! Could not remove ' + error)
+
+    if errors:
+        raise Exception(str(len(errors)) + ' path(s) could not be removed')
+
+    return len(files), len(directories)
+
+def Prune(directory, paths):
+    """
+    Remove the directories between `directory` and each of `paths` (relative)
+    that are now empty, deepest first; returns the number removed
+    """
+    parents = set()
+    for path in paths:
+        parent = os.path.dirname(path)
+        while parent:
+            parents.add(parent)
+            parent = os.path.dirname(parent)
+
+    removed = 0
+    for parent in sorted(parents, key=lambda p: p.count(os.sep), reverse=True):
+        try:
+            os.rmdir(os.path.join(directory, parent))
+            removed += 1
+        except OSError:
+            pass
+
+    return removed
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+
+#   Rocket - Client
+#
+#   Joe Gibson (gibsjose@mail.gvsu.edu)
+#
+#   17 August 2015
+#
+#   http://gibsjose.com
+#   http://github.com/gibsjose/Rocket
+
+# Essential Modules
+import os
+import stat
+import socket
+import itertools
+
+# Other Modules
+import json         # JSON
+
+def DefaultSocket():
+    """
+    Socket of the `rocket serve` daemon: `$ROCKET_SOCKET`, otherwise `rocket-<uid>.sock`
+    in `$XDG_RUNTIME_DIR`, or `rocket.sock` in a private `/tmp/rocket-<uid>/` directory
+    """
+    if os.environ.get('ROCKET_SOCKET'):
+        return os.environ['ROCKET_SOCKET']
+
+    if os.environ.get('XDG_RUNTIME_DIR'):
+        return os.path.join(os.environ['XDG_RUNTIME_DIR'], 'rocket-' + str(os.getuid()) + '.sock')
+
+    return os.path.join(PrivateDirectory(), 'rocket.sock')
+
+def PrivateDirectory():
+    """
+    Directory of the default socket when there is no `$XDG_RUNTIME_DIR`
+    """
+    return os.path.join('/tmp', 'rocket-' + str(os.getuid()))
+
+def Untrusted(path):
+    """
+    Why the socket at `path` cannot be trusted with this user's requests, or
+    None: it must be a socket owned by this user that nobody else can write to
+    """
+    status = os.lstat(path)
+
+    if not stat.S_ISSOCK(status.st_mode):
+        return 'Not a socket'
+
+    if status.st_uid != os.getuid():
+        return 'Owned by another user'
+
+    if status.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        return 'Writable by other users'
+
+    return None
+
+class Client:
+    """
+    Sends JSON-RPC 2.0 requests (one JSON object per line) to a `rocket serve` daemon
+    """
+    def __init__(self, path=None):
+        """
+        Sets the daemon's socket path (default: `DefaultSocket()`)
+        """
+        self.path = path or DefaultSocket()
+        self.socket = None
+        self.ids = itertools.count(1)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.Close()
+        return False
+
+    def Connect(self):
+        """
+        Connect to the daemon, returning False if none is running
+        """
+        if not os.path.exists(self.path):
+            return False
+
+        # Another user could have made the socket to receive (and answer) our requests
+        reason = Untrusted(self.path)
+        if reason is not None:
+            print('\t* Warning: Not using the rocket daemon on \'' + self.path + '\': ' + reason)
+            return False
+
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self.socket.connect(self.path)
+        except OSError:
+            self.Close()
+            return False
+
+        self.file = self.socket.makefile('rwb')
+        return True
+
+    def Call(self, method, params=None):
+        """
+        Send a request and wait for its result
+
+        Anything the request printed is in the result's `output`. Errors are
+        raised as exceptions, after printing the output of the failed request.
+        """
+        request = {'jsonrpc': '2.0', 'id': next(self.ids), 'method': method, 'params': params or {}}
+        self.file.write((json.dumps(request) + '\n').encode('utf-8'))
+        self.file.flush()
+
+        line = self.file.readline()
+        if not line:
+            raise Exception('The rocket daemon closed the connection')
+
+        response = json.loads(line.decode('utf-8'))
+        if 'error' in response:
+            print((response['error'].get('data') or {}).get('output', ''), end='')
+            raise Exception(response['error']['message'])
+
+        return response['result']
+
+    def Close(self):
+        """
+        Close the connection
+        """
+        if self.socket is not None:
+            self.socket.close()
+            self.socket = None
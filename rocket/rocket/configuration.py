@@ -10,21 +10,83 @@
 #   http://github.com/gibsjose/Rocket
 
 # Essential Modules
-import sys
 import os
-import re
-import operator
 import time
-import datetime
+import copy
 
 # Other Modules
 import json         # JSON
-import shutil       # File Copying, `which()`, etc.
-import subprocess   # Call shell commands for `git`
 
 # Local Modules
 from rocket.language import Language
-import rocket.language
+from rocket.schema import Field, Schema
+import rocket.profiler
+
+# Schema of `language.json`
+LanguageSchema = Schema({
+    'language': Field(str),
+    # Naming convention of generated file names
+    'naming': Field(str, attribute='naming', convert=lambda naming: naming.replace(' ', '-').lower()),
+    # Source file suffixes
+    'sources': Field(list, default=[], attribute='sources', items=Field(str)),
+    # Whether source files keep their extension
+    'extension': Field(bool, default=True, attribute='extension'),
+    # Other names accepted for the language, e.g. 'c++' for 'cpp'
+    'aliases': Field(list, default=[], attribute='aliases', items=Field(str),
+                     convert=lambda aliases: [alias.lower() for alias in aliases]),
+    # Directory (relative to the project) that skeleton files are copied into
+    'source-directory': Field(str, default='src', attribute='source_directory', convert=lambda directory: directory.strip('/')),
+    # Skeleton files to copy (default: everything under `skeleton/`)
+    'skeleton': Field(list, attribute='skeleton', items=Field(str)),
+    # Mark generated source files executable (e.g. Python scripts)
+    'executable': Field(bool, default=False, attribute='executable')
+})
+
+# Schema of `config.json`
+ConfigSchema = Schema({
+    'language': Field(str, required=True, attribute='language_string'),
+    'project': Field(str, required=True, attribute='project'),
+    'authors': Field(list, required=True, attribute='authors', minimum=1, items=Field(dict, fields={
+        'name': Field(str, required=True),
+        'email': Field(str)
+    })),
+    'description': Field(str, default='', attribute='description'),
+    'websites': Field(list, default=[], attribute='websites', items=Field(str)),
+    'license': Field(str, attribute='license'),
+    'license-url': Field(str, attribute='license_url'),
+    'git': Field(bool, default=False, attribute='git'),
+    'git-push': Field(bool, attribute='git_push'),
+    'git-remote': Field(str, attribute='git_remote'),
+    # Write the repository directly instead of running `git` commands
+    'git-native': Field(bool, default=True, attribute='git_native'),
+    # Build options: generated makefiles (C/C++), bytecode and zipapp (Python)
+    'build': Field(dict, default={}, attribute='build', fields={
+        'compiler-cache': Field(str),
+        'precompiled-header': Field(bool),
+        'unity-build': Field(bool),
+        'jobs': Field(int, minimum=0),
+        'profiles': Field(list, items=Field(str, choices=['lto', 'native', 'pgo'])),
+        'pgo-training': Field(str),
+        'source-manifest': Field(bool),
+        'version': Field(bool),
+        'timing': Field(bool),
+        'bytecode': Field(bool),
+        'zipapp': Field(bool)
+    })
+})
+
+# Decoded `config.json` files, by absolute path: `(stat signature, registry
+# directory and signature, attributes)`
+Decoded = {}
+
+# Number of decoded `config.json` files kept
+DecodedSize = 1024
+
+def Invalid(filename, errors):
+    """
+    Exception listing every error found in a JSON file
+    """
+    return Exception('Invalid ' + filename + ' (' + str(len(errors)) + ' error(s)):' + ''.join('\n\t! ' + error for error in errors))
 
 class LanguageConfiguration:
     """
@@ -32,49 +94,38 @@ class LanguageConfiguration:
     """
     def __init__(self):
         """
-        Default constructor
+        Default constructor: default attributes until a `language.json` is loaded
         """
-        self.data = {}
+        self.Load({})
         self.exists = False
-        self.naming = None
-        self.sources = []
-        self.extension = True
 
     def Decode(self, filepath):
         """
         Try to read in and parse language config file
         """
         if os.path.exists(filepath):
-            self.exists = True
-
             # Read language JSON data
             with open(filepath, encoding='utf-8') as lang_file:
                 # Load JSON data
-                self.data = json.loads(lang_file.read())
-
-                # Naming
-                if 'naming' in self.data:
-                    self.naming = self.data['naming'].replace(' ', '-').lower()
-                else:
-                    self.naming = None
-
-                # Sources
-                if 'sources' in self.data:
-                    self.sources = self.data['sources']
-                else:
-                    self.sources = []
-
-                # extension
-                if 'extension' in self.data:
-                    self.extension = self.data['extension']
-                else:
-                    self.extension = True
+                data = json.loads(lang_file.read())
+
+            errors = LanguageSchema.Validate(data)
+            if errors:
+                raise Invalid(filepath, errors)
+
+            self.Load(data)
 
         else:
+            self.Load({})
             self.exists = False
-            self.naming = None
-            self.sources = []
-            self.extension = True
+
+    def Load(self, data):
+        """
+        Set the language attributes from decoded (and valid) `language.json` data
+        """
+        self.exists = True
+        self.data = data
+        LanguageSchema.Apply(self, data)
 
 class Configuration:
     def __init__(self):
@@ -83,9 +134,10 @@ class Configuration:
         """
         self.data = {}
 
-    def Modify(self, in_file, out_file, language_string, project):
+    def Modify(self, in_file, out_file, language_string, project, overrides=None, writer=None):
         """
-        Read in the JSON `in_file`, modify the language and project attributes, and write it out as the JSON `out_file`
+        Read in the JSON `in_file`, modify the language and project attributes (and any other
+        `overrides`), and write it out as the JSON `out_file`
         """
         # Check if config file exists
         if not os.path.exists(in_file):
@@ -101,9 +153,16 @@ class Configuration:
             # Modify project string
             self.data['project'] = project
 
-        with open(out_file, 'w', encoding='utf-8') as out_fp:
-            # Write JSON data
-            json.dump(self.data, out_fp, sort_keys=True, indent=4)
+            # Apply any other attributes
+            if overrides:
+                self.data.update(overrides)
+
+        # Write JSON data
+        if writer:
+            writer.Write(out_file, json.dumps(self.data, sort_keys=True, indent=4))
+        else:
+            with open(out_file, 'w', encoding='utf-8') as out_fp:
+                json.dump(self.data, out_fp, sort_keys=True, indent=4)
 
     def Encode(self, filepath):
         """
@@ -112,99 +171,86 @@ class Configuration:
         with open(filepath, 'w', encoding='utf-8') as config_file:
             json.dump(self.data, config_file, sort_keys=True, indent=4)
 
-    def Decode(self, filepath):
+    def Decode(self, filepath, registry):
         """
-        Decode the configuration file as a Python JSON object (dictionary)
+        Decode the configuration file as a Python JSON object (dictionary),
+        resolving the language through the language `registry`
+
+        Decoded files are kept while their mtime, size and inode stay the same
+        and the registry is loaded from the same `languages/` tree, so decoding
+        the same unchanged file again (e.g. in a daemon or a batch) neither
+        reads nor validates it again. Every decode gets its own copy of the
+        attributes.
         """
-        # Get current date in `DD MONTH YYYY` format
-        today = datetime.date.today()
-        self.date = today.strftime('%d %b %Y')
-
         # Check if config file exists
-        if not os.path.exists(filepath):
+        try:
+            stat = os.stat(filepath)
+        except FileNotFoundError:
             raise Exception('Configuration file does not exist at ' + filepath)
 
+        key = os.path.abspath(filepath)
+        signature = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        languages = (registry.directory, registry.signature)
+
+        cached = Decoded.get(key)
+        if cached is not None and cached[0] == signature and cached[1] == languages:
+            self.__dict__.update(copy.deepcopy(cached[2]))
+            self.Resolve(registry)
+            self.date = time.strftime('%d %b %Y')
+            return
+
         # Read config JSON data
         with open(filepath, encoding='utf-8') as config_file:
             # Load JSON data
-            self.data = json.loads(config_file.read())
+            text = config_file.read()
+            rocket.profiler.Read(len(text))
 
-            # Language (string)
-            if 'language' not in self.data:
-                raise Exception('Must specify \'language\' in config file')
+        self.Load(json.loads(text), registry)
 
-            self.language_string = self.data['language']
+        # Language entries belong to the registry: looked up again on each decode
+        attributes = {name: value for name, value in self.__dict__.items() if name != 'language_entry'}
 
-            # Language (enum)
-            lang = self.language_string.lower()
-            if lang in rocket.language.LanguageDictionary:
-                self.language = rocket.language.LanguageDictionary[lang]
-            else:
-                self.language = Language.unknown
-                raise Exception('Unknown language')
-
-            # Language (official name)
-            self.language_name = rocket.language.LanguageNameDictionary[self.language_string]
-
-            # Project name
-            if 'project' not in self.data:
-                raise Exception('Must specify \'project\' in config file')
-            self.project = self.data['project']
-
-            # Authors
-            if 'authors' not in self.data:
-                raise Exception('Must specify at least one author under \'authors\' in config file')
-            self.authors = self.data['authors']
-
-            for author in self.authors:
-                if 'name' not in author:
-                    raise Exception('Authors must have \'name\' attribute')
+        Decoded.pop(key, None)
+        Decoded[key] = (signature, languages, copy.deepcopy(attributes))
+        if len(Decoded) > DecodedSize:
+            del Decoded[next(iter(Decoded))]
 
-            if 'description' in self.data:
-                self.description = self.data['description']
-            else:
-                self.description = ''
+    def Load(self, data, registry):
+        """
+        Set the configuration from decoded `config.json` data, resolving the
+        language through the language `registry`
 
-            # Websites
-            if 'websites' in self.data:
-                self.websites = self.data['websites']
-            else:
-                self.website = []
+        Every error in the data is reported at once.
+        """
+        # Get current date in `DD MONTH YYYY` format
+        self.date = time.strftime('%d %b %Y')
 
-            # License
-            if 'license' in self.data:
-                self.license = self.data['license']
-            else:
-                self.license = None
+        self.data = data
 
-            # License URL
-            if 'license-url' in self.data:
-                self.license_url = self.data['license-url']
-            else:
-                self.license_url = None
+        errors = ConfigSchema.Validate(data)
+        if errors:
+            raise Invalid('config file', errors)
 
-            # Git
-            if 'git' in self.data:
-                self.git = self.data['git']
-            else:
-                self.git = False
+        ConfigSchema.Apply(self, data)
+        self.Resolve(registry)
 
-            # GitHub
-            if 'git-push' in self.data:
-                self.git_push = self.data['git-push']
-            else:
-                self.git_push = None
+    def Resolve(self, registry):
+        """
+        Set the language (registry entry, enum and official name) from the language `registry`
+        """
+        self.language_entry = registry.Find(self.language_string)
+        if self.language_entry is None:
+            self.language = Language.unknown
+            raise Exception('Unknown language \'' + self.language_string + '\': Must be one of ' + ', '.join(registry.Names()))
 
-            if 'git-remote' in self.data:
-                self.git_remote = self.data['git-remote']
-            else:
-                self.git_remote = None
+        self.language = self.language_entry.language
+        self.language_name = self.language_entry.name
 
     def Print(self):
         print('Project: ' + self.project)
         print('Language: ' + self.language_string)
         print('Date: ' + self.date)
-        print('License: ' + self.license)
+        print('License: ' + str(self.license))
         print('Author(s):')
         for author in self.authors:
             print('\t' + author['name'], end='')
@@ -219,6 +265,5 @@ class Configuration:
             for website in self.websites:
                 print('\t' + website)
         print('Git: ' + str(self.git))
-        print('Create GitHub Repo: ' + str(self.git_create))
-        print('GitHub Remote: ' + self.git_remote)
-        print('GitHub User: ' + self.git_user)
+        print('Push to Remote: ' + str(self.git_push))
+        print('Git Remote: ' + str(self.git_remote))
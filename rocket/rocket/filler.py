@@ -10,25 +10,85 @@
 #   http://github.com/gibsjose/Rocket
 
 # Essential Modules
-import sys
 import os
 import re
-import tempfile
-import shutil
+import mmap
+import hashlib
+import concurrent.futures
 
 # Local Modules
-from rocket.language import Language
-import rocket.configuration
+import rocket.profiler
+import rocket.state
+import rocket.template
+import rocket.writer
+
+# Matches C/C++ header files
+HeaderExpression = re.compile(r'^.+\.h$')
+
+# Files at least this large (e.g. vendored headers, generated tables) are streamed instead of read whole
+StreamSize = 1 << 20
+
+# Worker pools for rendering several files at once
+#   - 'thread': Threads, for I/O-bound rendering (e.g. projects on network filesystems)
+#   - 'process': Processes, for CPU-heavy templates
+Pools = ['thread', 'process']
+
+def MakefileVariables(configuration, binary):
+    """
+    Values of the makefile `{VARIABLE}` tags, from the binary name and the `build` options
+    """
+    build = configuration.build
+    jobs = build.get('jobs')
+
+    # The fork-free makefile only stamps versions and times builds when asked to
+    forks = not build.get('source-manifest')
+
+    return {
+        'BIN': binary,
+        'COMPILER-CACHE': build.get('compiler-cache') or '',
+        'PRECOMPILED-HEADER': 'true' if build.get('precompiled-header') else 'false',
+        'UNITY-BUILD': 'true' if build.get('unity-build') else 'false',
+        'JOBS': '' if jobs is None else str(jobs),
+        'PROFILES': ' '.join(build.get('profiles') or []),
+        'PGO-TRAINING': build.get('pgo-training') or '',
+        'SOURCE-MANIFEST': 'true' if build.get('source-manifest') else 'false',
+        'VERSIONING': 'true' if build.get('version', forks) else 'false',
+        'TIMING': 'true' if build.get('timing', forks) else 'false'
+    }
+
+def FillMakefile(makefile, variables):
+    """
+    Replace the makefile `{VARIABLE}` tags
+    """
+    for name, value in variables.items():
+        makefile = makefile.replace('{' + name + '}', value)
+
+    return makefile
 
 class CommentFiller:
     """
     Replaces comment blocks in files with the appropriate data
     """
-    def __init__(self, configuration):
+    def __init__(self, configuration, cache=None, writer=None, state=None, jobs=1, pool='thread'):
         """
-        Sets configuration values
+        Sets configuration values, the (optional) template cache, the file
+        writer, the (optional) project `State` for incremental runs, and the
+        number of files rendered at once (0: number of CPUs) and the kind of
+        worker pool (see `Pools`)
         """
+        if pool not in Pools:
+            raise Exception('Unknown pool \'' + str(pool) + '\': Must be one of ' + ', '.join(Pools))
+
+        if jobs is not None and jobs < 0:
+            raise Exception('Invalid number of jobs \'' + str(jobs) + '\': Must be 0 (number of CPUs) or more')
+
         self.configuration = configuration
+        self.cache = cache
+        self.writer = writer or rocket.writer.FileWriter()
+        self.state = state
+        self.jobs = jobs or os.cpu_count() or 1
+        self.pool = pool
+        self.context = None
 
     def Replace(self, files):
         """
@@ -36,161 +96,234 @@ class CommentFiller:
         """
         self.files = files
 
+        # Get header file name
+        header = None
         for f in self.files:
-            self.ReplaceInFile(f)
+            if HeaderExpression.match(f):
+                header = os.path.basename(f)
+
+        # Tag values are the same for every file in the project
+        self.context = rocket.template.Context(self.configuration, header)
+
+        if self.jobs == 1 or len(self.files) < 2:
+            for f in self.files:
+                self.Finish(f, self.ReplaceInFile(f))
+            return
+
+        # Files are rendered in any order, but reported (and recorded) in order
+        if self.pool == 'process':
+            # Worker processes send their profiling records back with their results
+            origin = rocket.profiler.Current.origin if rocket.profiler.Current.enabled else None
+            executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.jobs)
+            futures = [executor.submit(ReplaceInFile, self, f, origin) for f in self.files]
+        else:
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.jobs)
+            futures = [executor.submit(self.ReplaceInFile, f) for f in self.files]
+
+        failures = 0
+        with executor:
+            for f, future in zip(self.files, futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    failures += 1
+                    print('\t! Failed ' + os.path.basename(f) + ': ' + str(e))
+                    continue
+
+                if self.pool == 'process':
+                    result, records = result
+                    rocket.profiler.Current.Add(records)
+
+                self.Finish(f, result)
+
+        if failures:
+            raise Exception(str(failures) + ' file(s) could not be configured')
+
+    def Finish(self, filepath, result):
+        """
+        Report a rendered file and record it in the project state
+
+        `result` is `(written, record)`, where `record` is the arguments for
+        `State.Record` (or None if there is nothing to record).
+        """
+        written, record = result
+
+        if self.state and record is not None:
+            self.state.Record(filepath, *record)
+
+        if written:
+            # Written in a worker process: apply the fsync mode here
+            if self.pool == 'process' and self.jobs != 1:
+                self.writer.Written(filepath, os.path.dirname(os.path.abspath(filepath)))
+            print('\t> Configured ' + os.path.basename(filepath))
+        else:
+            print('\t> Unchanged ' + os.path.basename(filepath))
 
     def ReplaceInFile(self, filepath):
         """
-        Replace the comment tags with actual data in a source file
+        Replace the comment tags with actual data in a source file, returning
+        `(written, record)` for `Finish`
         """
         if not os.path.exists(filepath):
             raise Exception('Cannot modify \'' + filepath + '\': Does not exist')
 
-        #Create temp file
-        new_fh, new_path = tempfile.mkstemp()
-        with open(new_path,'w') as new_file:
-            with open(filepath, 'r+') as old_file:
-                # Get header file name
-                for f in self.files:
-                    regex = re.compile(r'^.+\.h$')
-                    if regex.match(f):
-                        header = os.path.basename(f)
-
-                # First make as many lines as are needed for the authors/websites/etc. in a temp file
-                temp_fh, temp_path = tempfile.mkstemp()
-                with open(temp_path,'w') as temp_file:
-                    for line in old_file:
-                        if ('{AUTHOR-NAME}' in line) or ('{AUTHOR-EMAIL}' in line):
-                            for author in self.configuration.authors:
-                                temp_file.write(line)
-                        elif '{WEBSITE}' in line:
-                            for website in self.configuration.websites:
-                                temp_file.write(line)
-                        elif '{LICENSE}':
-                            if self.configuration.license or self.configuration.license_url:
-                                temp_file.write(line)
-                        else:
-                            temp_file.write(line)
-
-                    author_index = 0
-                    website_index = 0
-
-                with open(temp_path,'r') as temp_file:
-                    for line in temp_file:
-                        # {TITLE}
-                        if '{TITLE}' in line:
-                            new_file.write(line.replace('{TITLE}', self.configuration.project))
-
-                        # {DD MONTH YYYY}
-                        elif '{DD MONTH YYYY}' in line:
-                            new_file.write(line.replace('{DD MONTH YYYY}', self.configuration.date))
-
-                        # {LICENSE}
-                        elif '{LICENSE}' in line:
-                            license = 'License: '
-
-                            if self.configuration.license:
-                                if not self.configuration.license_url:
-                                    license += self.configuration.license
-                                else:
-                                    license += self.configuration.license + ' ('
-
-                            if self.configuration.license_url:
-                                if not self.configuration.license:
-                                    license += self.configuration.license_url
-                                else:
-                                    license += self.configuration.license_url + ')'
-
-                            if self.configuration.license or self.configuration.license_url:
-                                new_file.write(line.replace('{LICENSE}', license))
-
-                        # {AUTHOR-NAME} and {AUTHOR-EMAIL}
-                        elif '{AUTHOR-NAME}' in line or '{AUTHOR-EMAIL}' in line:
-                            auth = self.configuration.authors[author_index]
-                            auth_name = auth['name'];
-                            if 'email' in auth:
-                                auth_email = auth['email']
-                            else:
-                                auth_email = ''
-
-                            new_line = line.replace('{AUTHOR-NAME}', auth_name)
-                            new_line = new_line.replace('{AUTHOR-EMAIL}', auth_email)
-
-                            new_file.write(new_line)
-
-                            author_index += 1
-
-                        # {DESCRIPTION}
-                        elif '{DESCRIPTION}' in line:
-                            description = self.configuration.description
-
-                            if description:
-                                new_file.write(line.replace('{DESCRIPTION}', description))
-
-                        # {WEBSITE}
-                        elif '{WEBSITE}' in line:
-                            website = self.configuration.websites[website_index]
-                            new_file.write(line.replace('{WEBSITE}', website))
-
-                            website_index += 1
-
-                        # Header guards
-                        elif '{GUARD}' in line:
-                            guard = self.configuration.project.replace(' ', '_').upper() + '_H'
-                            new_file.write(line.replace('{GUARD}', guard))
-
-                        # Includes
-                        elif '{HEADER}' in line:
-                            new_file.write(line.replace('{HEADER}', header))
-
-                        # Write all other lines as they are
-                        else:
-                            new_file.write(line)
-
-        #Remove original file
-        os.remove(filepath)
-
-        #Move new file
-        shutil.move(new_path, filepath)
+        if os.path.getsize(filepath) >= StreamSize:
+            return self.StreamFile(filepath)
 
-        print('\t> Configured ' + os.path.basename(filepath))
+        with rocket.profiler.Record('render', filepath):
+            with open(filepath, 'r') as old_file:
+                text = old_file.read()
+            rocket.profiler.Read(len(text))
+
+            # Re-render from the original template if the file is untouched since the last run
+            source, entry = text, None
+            if self.state:
+                source, entry = self.state.Template(filepath, text)
+
+            if self.cache:
+                template = self.cache.Template(source)
+            else:
+                template = rocket.template.Template().Parse(source)
+
+            inputs = self.context.Inputs(template.Tags())
+
+            # Nothing the file depends on changed (the template is recorded for state files without it)
+            if entry is not None and entry['inputs'] == inputs:
+                return False, (entry['template'], inputs, entry['output'], entry, source)
+
+            content = template.Render(self.context)
+            record = (rocket.state.Digest(source), inputs, rocket.state.Digest(content), entry, source)
+
+            # Skip identical writes to keep the mtime (and `make` from rebuilding)
+            if content == text:
+                return False, record
+
+            self.writer.Write(filepath, content)
+
+        return True, record
+
+    def StreamFile(self, filepath):
+        """
+        Replace the comment tags in a large file without reading it into memory
+        """
+        with rocket.profiler.Record('stream', filepath):
+            digest = rocket.state.FileDigest(filepath)
+
+            # Re-render from the original template if the file is untouched since the last run
+            source, entry = filepath, None
+            if self.state:
+                path, entry = self.state.Source(filepath, digest)
+                kept = self.cache.Kept(entry['template']) if self.cache and entry is not None else None
+                if kept:
+                    source = kept
+                elif path is not None and os.path.exists(path) and rocket.state.FileDigest(path) == entry['template']:
+                    source = path
+                else:
+                    if path is not None:
+                        rocket.state.Frozen(filepath)
+                    entry = None
+
+                # Too large for the state file: the original template is kept in the cache
+                if self.cache and (entry is not None or self.state.origins.get(self.state.Key(filepath))):
+                    self.cache.Keep(entry['template'] if entry is not None else digest, source)
+
+            with open(source, 'rb') as source_file, mmap.mmap(source_file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                rocket.profiler.Read(len(buffer))
+
+                template = rocket.template.StreamTemplate(buffer)
+                inputs = self.context.Inputs(template.Tags())
+
+                # Nothing the file depends on changed
+                if entry is not None and entry['inputs'] == inputs:
+                    return False, None
+
+                # A file without tags renders to itself
+                if source == filepath and not template.Lines():
+                    return False, (digest, inputs, digest, None)
+
+                output = hashlib.sha1()
+                pending = self.writer.Open(filepath)
+
+                def write(content):
+                    output.update(content)
+                    pending.Write(content)
+
+                try:
+                    template.Render(self.context, write)
+                except BaseException:
+                    pending.Discard()
+                    raise
+
+            template_digest = entry['template'] if entry is not None else digest
+            record = (template_digest, inputs, output.hexdigest(), entry)
+
+            # Skip identical writes to keep the mtime (and `make` from rebuilding)
+            if output.hexdigest() == digest:
+                pending.Discard()
+                return False, record
+
+            pending.Commit()
+
+        return True, record
+
+def ReplaceInFile(filler, filepath, origin=None):
+    """
+    Process pool worker: `filler.ReplaceInFile(filepath)` in a child process,
+    returned with the profiling records it took if `origin` (the parent's
+    profiling origin) is set
+    """
+    if origin is None:
+        return filler.ReplaceInFile(filepath), []
+
+    rocket.profiler.Current.Worker(origin)
+    result = filler.ReplaceInFile(filepath)
+    return result, rocket.profiler.Current.Take()
 
 class MakefileFiller:
     """
     Replaces items in makefiles with appropriate data
     """
-    def __init__(self, configuration):
+    def __init__(self, configuration, writer=None, state=None):
         """
-        Sets configuration values
+        Sets configuration values, the file writer and the (optional) project `State`
         """
         self.configuration = configuration
+        self.writer = writer or rocket.writer.FileWriter()
+        self.state = state
 
     def Replace(self, filepath, binary):
         """
         Replace the makefile variables with actual data
         """
-        if self.configuration.language == Language.python:
+        if not self.configuration.language_entry.makefile:
             return
 
         if not os.path.exists(filepath):
             raise Exception('Cannot modify \'' + filepath + '\': Does not exist')
 
-        #Create temp file
-        new_fh, new_path = tempfile.mkstemp()
-        with open(new_path,'w') as new_file:
+        with rocket.profiler.Record('makefile', filepath):
             with open(filepath) as old_file:
-                for line in old_file:
-                    # {BIN}
-                    if '{BIN}' in line:
-                        new_file.write(line.replace('{BIN}', binary))
+                makefile = old_file.read()
+            rocket.profiler.Read(len(makefile))
+
+            source, entry = makefile, None
+            if self.state:
+                source, entry = self.state.Template(filepath, makefile)
+
+            inputs = MakefileVariables(self.configuration, binary)
+            if entry is not None and entry['inputs'] == inputs:
+                self.state.Record(filepath, entry['template'], inputs, entry['output'], entry, source)
+                print('\t> Unchanged ' + os.path.basename(filepath))
+                return
 
-                    else:
-                        new_file.write(line)
+            content = FillMakefile(source, inputs)
+            if self.state:
+                self.state.Record(filepath, rocket.state.Digest(source), inputs, rocket.state.Digest(content), entry, source)
 
-        #Remove original file
-        os.remove(filepath)
+            if content == makefile:
+                print('\t> Unchanged ' + os.path.basename(filepath))
+                return
 
-        #Move new file
-        shutil.move(new_path, filepath)
+            self.writer.Write(filepath, content)
 
         print('\t> Configured ' + os.path.basename(filepath))
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+
+#   Rocket - Generator
+#
+#   Joe Gibson (gibsjose@mail.gvsu.edu)
+#
+#   17 August 2015
+#
+#   http://gibsjose.com
+#   http://github.com/gibsjose/Rocket
+
+# Essential Modules
+import os
+import stat
+
+# Other Modules
+import json         # JSON
+
+# Local Modules
+import rocket.bytecode
+import rocket.configuration
+import rocket.filler
+import rocket.namer
+import rocket.registry
+import rocket.state
+import rocket.template
+import rocket.writer
+
+# The Rocket directory this module belongs to (`<Rocket>/rocket/rocket/generator.py`)
+RocketDirectory = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Permissions of generated files that have no template (e.g. `config.json`)
+DefaultMode = 0o644
+
+def Readme(configuration):
+    """
+    Contents of the generated `README.md`
+    """
+    # @TODO Write license/other info here
+    return '# ' + configuration.project + '\n' + configuration.date + '\n'
+
+def GitIgnore(entry, name, template=''):
+    """
+    Contents of the generated `.gitignore`, from the language's `.gitignore` text
+    """
+    gitignore = template
+
+    # Add executable name to .gitignore for projects built with a makefile
+    if entry.makefile:
+        gitignore += '\n# Actual binary\n' + name
+
+    # `rocket config` state is local to each checkout
+    gitignore += '\n# Rocket state\n' + rocket.state.State.filename + '\n'
+
+    return gitignore
+
+class Generator:
+    """
+    Generates whole projects in memory, as `{relative path: (bytes, mode)}`
+
+    Nothing is written or printed and the working directory is never used.
+    Language files are read the first time they are needed and then kept, so
+    a long-lived generator does no disk I/O at all once warm, and can be
+    shared between threads.
+    """
+    def __init__(self, r_dir=None, registry=None):
+        """
+        Sets the Rocket directory (default: the one this module is in) and the
+        language registry (default: scanned from its `languages/` directory)
+        """
+        self.dir = r_dir or RocketDirectory
+        self.registry = registry or rocket.registry.Registry(os.path.join(self.dir, 'languages')).Load()
+        self.files = {}
+        self.templates = {}
+
+    def Read(self, filepath):
+        """
+        `(bytes, mode)` of a language file, read once
+        """
+        if filepath not in self.files:
+            with open(filepath, 'rb') as in_file:
+                self.files[filepath] = (in_file.read(), os.stat(filepath).st_mode & 0o7777)
+
+        return self.files[filepath]
+
+    def Template(self, filepath):
+        """
+        Parsed `Template` of a skeleton file, parsed once
+        """
+        if filepath not in self.templates:
+            # Same newline handling as reading the file in text mode
+            text = self.Read(filepath)[0].decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+            self.templates[filepath] = rocket.template.Template().Parse(text)
+
+        return self.templates[filepath]
+
+    def Config(self, language, project, overrides=None):
+        """
+        The `config.json` dictionary `rocket create` writes for a new project
+        """
+        entry = self.registry.Find(language)
+        if entry is None:
+            raise Exception('Unknown language \'' + language + '\': Must be one of ' + ', '.join(self.registry.Names()))
+
+        config = json.loads(self.Read(os.path.join(self.dir, 'config.json'))[0].decode('utf-8'))
+        config['language'] = entry.name
+        config['project'] = project
+        if overrides:
+            config.update(overrides)
+
+        return config
+
+    def Generate(self, config, language=None, date=None):
+        """
+        Generate the project described by `config` (the contents of a
+        `config.json`, as a dictionary), as `rocket create` followed by
+        `rocket config` would, minus the `git` repository
+
+        `language` overrides `config['language']`, and `date` the generated
+        'DD MONTH YYYY' date (default: today).
+        """
+        return {path: (content, mode) for path, content, mode in self.Files(config, language, date)}
+
+    def Files(self, config, language=None, date=None):
+        """
+        Same as `Generate`, but yields `(path, bytes, mode)` one file at a
+        time, as soon as each file is rendered
+        """
+        data = dict(config)
+        if language is not None:
+            data['language'] = language
+
+        configuration = rocket.configuration.Configuration()
+        configuration.Load(data, self.registry)
+        if date is not None:
+            configuration.date = date
+
+        entry = configuration.language_entry
+        namer = rocket.namer.FileNamer(configuration)
+        namer.name = namer.Name()
+
+        yield 'config.json', json.dumps(data, sort_keys=True, indent=4).encode('utf-8'), DefaultMode
+
+        # Skeleton code: source files are renamed and templated
+        sources = tuple(entry.configuration.sources)
+        templated = []
+        for f in entry.skeleton:
+            skeleton = os.path.join(entry.directory, 'skeleton', f)
+            path = os.path.join(entry.configuration.source_directory, f)
+            content, mode = self.Read(skeleton)
+
+            if not f.endswith(sources):
+                yield path, content, mode
+                continue
+
+            if entry.configuration.executable:
+                mode = stat.S_IRWXU
+
+            templated.append((namer.RenamedPath(path), skeleton, mode))
+
+        header = None
+        for path, skeleton, mode in templated:
+            if rocket.filler.HeaderExpression.match(path):
+                header = os.path.basename(path)
+
+        context = rocket.template.Context(configuration, header)
+        for path, skeleton, mode in templated:
+            content = self.Template(skeleton).Render(context).encode('utf-8')
+            yield path, content, mode
+
+            # Single-file zipapp of the main Python script
+            if configuration.build.get('zipapp') and os.path.basename(path) == namer.name + '.py':
+                yield namer.name + '.pyz', rocket.bytecode.Zipapp(content), rocket.bytecode.ZipappMode
+
+        if entry.makefile:
+            content, mode = self.Read(entry.makefile)
+            variables = rocket.filler.MakefileVariables(configuration, namer.name)
+            yield 'makefile', rocket.filler.FillMakefile(content.decode('utf-8'), variables).encode('utf-8'), mode
+
+        if configuration.git:
+            gitignore = ''
+            if entry.gitignore:
+                gitignore = self.Read(entry.gitignore)[0].decode('utf-8')
+
+            yield 'README.md', Readme(configuration).encode('utf-8'), DefaultMode
+            yield '.gitignore', GitIgnore(entry, namer.name, gitignore).encode('utf-8'), DefaultMode
+
+# Shared by `Generate()`, created on first use
+Default = None
+
+def Generate(config, language=None, date=None):
+    """
+    Generate a project in memory with a shared `Generator` for the Rocket directory this module is in
+    """
+    global Default
+
+    if Default is None:
+        Default = Generator()
+
+    return Default.Generate(config, language, date)
+
+def WriteTree(tree, directory, writer=None):
+    """
+    Write a generated tree under `directory` (created if needed), atomically file by file
+    """
+    writer = writer or rocket.writer.FileWriter()
+
+    for path in sorted(tree):
+        content, mode = tree[path]
+        filepath = os.path.join(directory, path)
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        writer.Write(filepath, content, mode)
+
+    writer.Sync()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+
+#   Rocket - Git
+#
+#   Joe Gibson (gibsjose@mail.gvsu.edu)
+#
+#   17 August 2015
+#
+#   http://gibsjose.com
+#   http://github.com/gibsjose/Rocket
+
+# Essential Modules
+import os
+import stat
+import time
+import zlib
+import struct
+import hashlib
+
+class Repository:
+    """
+    Writes a `git` repository directly: `.git/` layout, loose objects, the
+    index, refs and remote configuration, without running the `git` binary
+    """
+    def __init__(self, directory, branch='master'):
+        """
+        Sets the work tree directory and the branch to commit to
+        """
+        self.directory = os.path.abspath(directory)
+        self.git_dir = os.path.join(self.directory, '.git')
+        self.branch = branch
+
+    def Init(self):
+        """
+        Create the `.git` directory (like `git init`) and return git's status message
+        """
+        if os.path.exists(os.path.join(self.git_dir, 'HEAD')):
+            return 'Reinitialized existing Git repository in ' + self.git_dir + '/\n'
+
+        for d in ['objects/info', 'objects/pack', 'refs/heads', 'refs/tags', 'info', 'hooks']:
+            os.makedirs(os.path.join(self.git_dir, d), exist_ok=True)
+
+        self.WriteFile('HEAD', 'ref: refs/heads/' + self.branch + '\n')
+        self.WriteFile('description', 'Unnamed repository; edit this file \'description\' to name the repository.\n')
+        self.WriteFile('info/exclude', '# git ls-files --others --exclude-from=.git/info/exclude\n')
+        self.WriteFile('config', '[core]\n'
+                                 '\trepositoryformatversion = 0\n'
+                                 '\tfilemode = true\n'
+                                 '\tbare = false\n'
+                                 '\tlogallrefupdates = true\n')
+
+        return 'Initialized empty Git repository in ' + self.git_dir + '/\n'
+
+    def AddRemote(self, name, url):
+        """
+        Add a remote (like `git remote add`) to `.git/config`
+        """
+        if self.RemoteUrl(name) is not None:
+            raise Exception('remote ' + name + ' already exists.')
+
+        with open(os.path.join(self.git_dir, 'config'), 'a') as config:
+            config.write('[remote "' + name + '"]\n')
+            config.write('\turl = ' + url + '\n')
+            config.write('\tfetch = +refs/heads/*:refs/remotes/' + name + '/*\n')
+
+    def RemoteUrl(self, name):
+        """
+        URL of the remote `name`, or None if it does not exist
+        """
+        section = '[remote "' + name + '"]'
+        in_section = False
+
+        with open(os.path.join(self.git_dir, 'config')) as config:
+            for line in config:
+                line = line.strip()
+                if line.startswith('['):
+                    in_section = (line == section)
+                elif in_section and line.startswith('url'):
+                    return line.split('=', 1)[1].strip()
+
+        return None
+
+    def Commit(self, files, message, name, email):
+        """
+        Commit the given files (paths inside the work tree) as the first commit
+        on the branch, write a matching index, and return the commit hash
+        """
+        entries = []
+        for filepath in sorted(set(os.path.relpath(os.path.abspath(f), self.directory) for f in files)):
+            with open(os.path.join(self.directory, filepath), 'rb') as blob_file:
+                sha = self.WriteObject('blob', blob_file.read())
+
+            info = os.stat(os.path.join(self.directory, filepath))
+            mode = 0o100755 if info.st_mode & stat.S_IXUSR else 0o100644
+            entries.append((filepath.replace(os.sep, '/'), mode, sha, info))
+
+        tree = self.WriteTree([(path.split('/'), mode, sha) for path, mode, sha, info in entries])
+
+        timestamp = str(int(time.time())) + ' ' + self.TimeZone()
+        identity = name + ' <' + email + '> ' + timestamp
+        commit = self.WriteObject('commit', ('tree ' + tree + '\n' +
+                                             'author ' + identity + '\n' +
+                                             'committer ' + identity + '\n' +
+                                             '\n' + message + '\n').encode('utf-8'))
+
+        self.WriteFile('refs/heads/' + self.branch, commit + '\n')
+        self.WriteIndex(entries)
+
+        return commit
+
+    def WriteObject(self, kind, data):
+        """
+        Write a loose object and return its hex hash
+        """
+        content = kind.encode() + b' ' + str(len(data)).encode() + b'\0' + data
+        sha = hashlib.sha1(content).hexdigest()
+
+        path = os.path.join(self.git_dir, 'objects', sha[:2], sha[2:])
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as object_file:
+                object_file.write(zlib.compress(content))
+
+        return sha
+
+    def WriteTree(self, entries):
+        """
+        Recursively write tree objects for `(path components, mode, sha)` entries and return the root tree hash
+        """
+        blobs = {}
+        subtrees = {}
+        for parts, mode, sha in entries:
+            if len(parts) == 1:
+                blobs[parts[0]] = (mode, sha)
+            else:
+                subtrees.setdefault(parts[0], []).append((parts[1:], mode, sha))
+
+        items = []
+        for name, (mode, sha) in blobs.items():
+            items.append((name, name, '%o' % mode, sha))
+        for name, sub_entries in subtrees.items():
+            # Git sorts trees as if their names ended with '/'
+            items.append((name + '/', name, '40000', self.WriteTree(sub_entries)))
+
+        data = b''
+        for key, name, mode, sha in sorted(items):
+            data += mode.encode() + b' ' + name.encode('utf-8') + b'\0' + bytes.fromhex(sha)
+
+        return self.WriteObject('tree', data)
+
+    def WriteIndex(self, entries):
+        """
+        Write a version 2 `.git/index` for `(path, mode, sha, stat)` entries so the work tree is clean
+        """
+        data = b'DIRC' + struct.pack('>LL', 2, len(entries))
+
+        for path, mode, sha, info in sorted(entries, key=lambda entry: entry[0].encode('utf-8')):
+            name = path.encode('utf-8')
+            fields = [int(info.st_ctime), info.st_ctime_ns % 1000000000,
+                      int(info.st_mtime), info.st_mtime_ns % 1000000000,
+                      info.st_dev, info.st_ino, mode, info.st_uid, info.st_gid, info.st_size]
+            entry = struct.pack('>10L', *[field & 0xFFFFFFFF for field in fields])
+            entry += bytes.fromhex(sha) + struct.pack('>H', min(len(name), 0xFFF)) + name
+
+            # Entries are NUL-padded to a multiple of 8 bytes (at least one NUL)
+            entry += b'\0' * (8 - len(entry) % 8)
+            data += entry
+
+        data += hashlib.sha1(data).digest()
+
+        with open(os.path.join(self.git_dir, 'index'), 'wb') as index:
+            index.write(data)
+
+    def WriteFile(self, path, content):
+        """
+        Write a text file inside `.git`
+        """
+        with open(os.path.join(self.git_dir, path), 'w') as git_file:
+            git_file.write(content)
+
+    def TimeZone(self):
+        """
+        Local UTC offset in git's `+HHMM` format
+        """
+        offset = time.localtime().tm_gmtoff
+        sign = '+' if offset >= 0 else '-'
+        offset = abs(offset) // 60
+
+        return sign + '%02d%02d' % (offset // 60, offset % 60)
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+
+#   Rocket - Materializer
+#
+#   Joe Gibson (gibsjose@mail.gvsu.edu)
+#
+#   17 August 2015
+#
+#   http://gibsjose.com
+#   http://github.com/gibsjose/Rocket
+
+# Essential Modules
+import os
+import errno
+import shutil
+
+# Other Modules
+try:
+    import fcntl    # reflink ioctl (POSIX only)
+except ImportError:
+    fcntl = None
+
+# Linux `FICLONE` ioctl: share the source file's extents (reflink) on btrfs, XFS, ...
+FICLONE = 0x40049409
+
+# Copy mechanisms, cheapest first
+#   - 'reflink': Clone the extents, no data is copied (copy-on-write filesystems only)
+#   - 'copy_file_range': Copy inside the kernel, server-side on NFS 4.2
+#   - 'sendfile': Copy inside the kernel
+#   - 'copy': Plain read/write
+Mechanisms = ['reflink', 'copy_file_range', 'sendfile', 'copy']
+
+# Errors meaning a mechanism (or hardlinking) is not available here, rather than that the copy failed
+Unsupported = {errno.EXDEV, errno.EOPNOTSUPP, errno.ENOTSUP, errno.ENOTTY, errno.EINVAL, errno.ENOSYS, errno.EPERM, errno.EMLINK}
+
+class Materializer:
+    """
+    Copies skeleton trees into a new project using the cheapest mechanism the
+    filesystem supports, falling back (and remembering the fallback for the
+    rest of the run) whenever one is not supported
+    """
+    def __init__(self, writer=None, link=False):
+        """
+        Sets the file writer (for its fsync mode) and whether files that are
+        never templated may be hardlinked instead of copied
+        """
+        self.writer = writer
+        self.link = link
+        self.mechanisms = [mechanism for mechanism in Mechanisms if self.Available(mechanism)]
+        self.counts = {}
+
+    def Available(self, mechanism):
+        """
+        Whether this Python/OS provides a mechanism at all
+        """
+        if mechanism == 'reflink':
+            return fcntl is not None and hasattr(fcntl, 'ioctl')
+        elif mechanism == 'copy_file_range':
+            return hasattr(os, 'copy_file_range')
+        elif mechanism == 'sendfile':
+            return hasattr(os, 'sendfile')
+
+        return True
+
+    def Tree(self, source, destination, files, linkable=None):
+        """
+        Materialize `files` (paths relative to `source`) under `destination`,
+        hardlinking those for which `linkable(path)` is true if enabled
+        """
+        for f in files:
+            target = os.path.join(destination, f)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            self.Copy(os.path.join(source, f), target, bool(linkable and linkable(f)))
+
+    def Copy(self, src, dst, link=False):
+        """
+        Copy a single file (and its permissions), returning the mechanism used
+        """
+        # Never write through an existing file: it may be a hardlink to a skeleton
+        if os.path.lexists(dst):
+            os.remove(dst)
+
+        if link and self.link:
+            try:
+                os.link(src, dst)
+                return self.Count('hardlink')
+            except OSError as e:
+                if e.errno not in Unsupported:
+                    raise
+                self.link = False
+
+        with open(src, 'rb') as src_file, open(dst, 'wb') as dst_file:
+            size = os.fstat(src_file.fileno()).st_size
+
+            for mechanism in list(self.mechanisms):
+                try:
+                    self.Method(mechanism)(src_file, dst_file, size)
+                    break
+                except OSError as e:
+                    if e.errno not in Unsupported or mechanism == 'copy':
+                        raise
+
+                    # Not supported here: start over with the next mechanism, and skip it from now on
+                    self.mechanisms.remove(mechanism)
+                    src_file.seek(0)
+                    dst_file.seek(0)
+                    dst_file.truncate()
+
+            if self.writer and self.writer.sync == 'file':
+                dst_file.flush()
+                os.fsync(dst_file.fileno())
+
+        shutil.copymode(src, dst)
+
+        if self.writer:
+            self.writer.Written(dst, os.path.dirname(os.path.abspath(dst)))
+
+        return self.Count(mechanism)
+
+    def Method(self, mechanism):
+        """
+        Method implementing a mechanism, called as `method(src_file, dst_file, size)`
+        """
+        return {
+            'reflink': self.Reflink,
+            'copy_file_range': self.CopyFileRange,
+            'sendfile': self.Sendfile,
+            'copy': self.ReadWrite
+        }[mechanism]
+
+    def Count(self, mechanism):
+        """
+        Count a file materialized with `mechanism`, and return it
+        """
+        self.counts[mechanism] = self.counts.get(mechanism, 0) + 1
+        return mechanism
+
+    def Reflink(self, src_file, dst_file, size):
+        """
+        Clone the source file's extents into the destination
+        """
+        fcntl.ioctl(dst_file.fileno(), FICLONE, src_file.fileno())
+
+    def CopyFileRange(self, src_file, dst_file, size):
+        """
+        Copy with `copy_file_range(2)`
+        """
+        offset = 0
+        while offset < size:
+            copied = os.copy_file_range(src_file.fileno(), dst_file.fileno(), size - offset, offset, offset)
+            if copied == 0:
+                break
+            offset += copied
+
+    def Sendfile(self, src_file, dst_file, size):
+        """
+        Copy with `sendfile(2)`
+        """
+        offset = 0
+        while offset < size:
+            sent = os.sendfile(dst_file.fileno(), src_file.fileno(), offset, size - offset)
+            if sent == 0:
+                break
+            offset += sent
+
+    def ReadWrite(self, src_file, dst_file, size):
+        """
+        Copy through user space
+        """
+        shutil.copyfileobj(src_file, dst_file)
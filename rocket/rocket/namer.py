@@ -10,62 +10,56 @@
 #   http://github.com/gibsjose/Rocket
 
 # Essential Modules
-import sys
 import os
-import re
-import tempfile
-import stat
-
-# Other Modules
-import shutil       # File Copying, `which()`, etc.
 
 # Local Modules
 from rocket.language import Language
-import rocket.configuration
+import rocket.naming
+import rocket.writer
 
 class FileNamer:
     """
     Renames files with appropriate name
     """
-    def __init__(self, configuration, r_dir):
+    def __init__(self, configuration, writer=None):
         """
-        Sets configuration values and parses language config, if it exists
+        Sets configuration values and the language config from the language registry
         """
         self.configuration = configuration
+        self.writer = writer or rocket.writer.FileWriter()
+        self.language_configuration = configuration.language_entry.configuration
 
-        self.dir = r_dir
-        language_file = self.dir + '/languages/' + self.configuration.language_name + '/language.json'
-
-        self.language_configuration = rocket.configuration.LanguageConfiguration()
-        self.language_configuration.Decode(language_file)
+        # Source file suffixes, matched all at once with `str.endswith`
+        self.suffixes = tuple(self.language_configuration.sources)
 
     def SpacesToUnderscores(self, word):
         """
-        Converts spaces to lowercase underscores: 'Rocket Project' -> 'rocket_project'
+        Converts to lowercase underscores: 'Rocket Project' -> 'rocket_project'
         """
-        return word.replace(' ', '_').lower()
+        return rocket.naming.Convert(word, 'underscores')
 
     def SpacesToDashes(self, word):
         """
-        Converts spaces to lowercase dashes: 'Rocket Project' -> 'rocket-project'
+        Converts to lowercase dashes: 'Rocket Project' -> 'rocket-project'
         """
-        return word.replace(' ', '-').lower()
+        return rocket.naming.Convert(word, 'dashes')
 
     def UnderscoresToCamelCase(self, word):
         """
-        Converts lowercase underscores to CamelCase: 'rocket_project' -> 'RocketProject'
+        Converts to CamelCase: 'rocket_project' -> 'RocketProject'
         """
-        return ''.join(x.capitalize() or '_' for x in word.split('_'))
+        return rocket.naming.Convert(word, 'camel-case')
 
     def SpacesToCamelCase(self, word):
         """
-        Converts spaces to CamelCase: 'Rocket Project' -> 'RocketProject'
+        Converts to CamelCase: 'Rocket Project' -> 'RocketProject'
         """
-        return self.UnderscoresToCamelCase(self.SpacesToUnderscores(word))
+        return rocket.naming.Convert(word, 'camel-case')
 
-    def GenerateName(self):
+    def Naming(self):
         """
-        Generates a name for a file based on the project name and language type
+        `(naming, default)`: the naming style for the project's files ('dashes',
+        'underscores' or 'camel-case') and whether it is the language default
         """
         # First try to pull from the $(ROCKET_DIR)/languages/*/language.json file
         if self.language_configuration.exists:
@@ -74,100 +68,154 @@ class FileNamer:
             #   'underscores' or 'underscore': 'Rocket Project' -> 'rocket_project'
             #   'camel-case' or 'camelcase' or 'camel_case': 'Rocket Project' -> 'RocketProject'
             naming = self.language_configuration.naming
-            print('\t> Using naming: ' + naming)
 
             if naming == 'dashes' or naming == 'dash':
-                self.name = self.SpacesToDashes(self.configuration.project)
-                return
+                return 'dashes', False
 
             elif naming == 'underscores' or naming == 'underscore':
-                self.name = self.SpacesToUnderscores(self.configuration.project)
-                return
+                return 'underscores', False
 
             elif naming == 'camel-case' or naming == 'camelcase' or naming == 'camel_case':
-                self.name = self.SpacesToCamelCase(self.configuration.project)
-                return
+                return 'camel-case', False
 
             # If 'naming' attribute unrecognized, just break and use defaults below
-            else:
-                None;
 
         # Otherwise use defaults
         language = self.configuration.language
 
         # 'Rocket Project' -> 'rocket-project' for C
         if language == Language.c or language == Language.avr_c:
-            self.name =  self.SpacesToDashes(self.configuration.project)
-            print('\t> Defaulting to \'dashes\' naming for ' + self.configuration.language_string + ' projects')
+            return 'dashes', True
 
         # 'Rocket Project' -> 'RocketProject' for C++
         elif language == Language.cpp or language == Language.avr_cpp:
-            self.name = self.SpacesToCamelCase(self.configuration.project)
-            print('\t> Defaulting to \'camel-case\' naming for ' + self.configuration.language_string + ' projects')
+            return 'camel-case', True
 
-        # 'Rocket Project' -> 'rocket_project' for Python
-        elif language == Language.python:
-            self.name =  self.SpacesToUnderscores(self.configuration.project)
-            print('\t> Defaulting to \'underscores\' naming for ' + self.configuration.language_string + ' projects')
+        # 'Rocket Project' -> 'rocket_project' for Python and all else
+        return 'underscores', True
 
-        # 'Rocket Project' -> 'rocket_project' for all else
-        else:
-            self.name = self.SpacesToUnderscores(self.configuration.project)
-            print('\t> Defaulting to \'underscores\' naming for ' + self.configuration.language_string + ' projects')
+    def Name(self):
+        """
+        Name for the project's files, without printing anything
+        """
+        naming, default = self.Naming()
 
-        return
+        return rocket.naming.Convert(self.configuration.project, naming)
 
-    def Rename(self):
+    def GenerateName(self):
         """
-        Rename the files according to the project name
+        Generates a name for a file based on the project name and language type
+        """
+        if self.language_configuration.exists and self.language_configuration.naming:
+            print('\t> Using naming: ' + self.language_configuration.naming)
+
+        naming, default = self.Naming()
+        if default:
+            print('\t> Defaulting to \'' + naming + '\' naming for ' + self.configuration.language_string + ' projects')
+
+        self.name = self.Name()
+
+    def Rename(self, directory=None, manifest=None):
+        """
+        Rename the source files in the project `directory` (default: the
+        current directory) according to the project name
+
+        The source files are the ones listed in the `manifest` of files
+        `rocket create` made (`{path relative to the project: source}`), or
+        for projects without one, every source file found under the source
+        directory.
         """
         # Generate a name
         self.GenerateName()
         print('\t> Name generated: ' + self.name)
 
-        # Create file list
-        self.files = []
-        language = self.configuration.language
-        sources = self.language_configuration.sources
+        if directory is None:
+            directory = os.getcwd()
 
-        directory = os.getcwd()
+        src_directory = os.path.join(directory, self.language_configuration.source_directory)
 
-        if language == Language.python:
-            src_directory = directory + '/'
+        # Create file list
+        if manifest is not None:
+            prefix = os.path.join(self.language_configuration.source_directory, '') if self.language_configuration.source_directory else ''
+            self.files = [os.path.join(directory, path) for path in sorted(manifest)
+                          if path.startswith(prefix) and path.endswith(self.suffixes) and os.path.exists(os.path.join(directory, path))]
         else:
-            src_directory = directory + '/src/'
-
-        for f in os.listdir(src_directory):
-            for s in sources:
-                if f.endswith(s):
-                    self.files.append(src_directory + f)
+            self.files = self.Scan(src_directory)
 
-        # print('\t> Renaming the following files:')
-        # for f in self.files:
-        #     print('\t\t* ' + os.path.basename(f))
+        if not self.language_configuration.extension:
+            for s in self.language_configuration.sources:
+                print('\t> Dropping \'' + s + '\' extension')
 
         # Rename all files
-        self.renamed = []
-        for f in self.files:
-            self.renamed.append(self.RenameFile(f))
-
-        # print('\t> to:')
-        # for f in self.renamed:
-        #     print('\t\t* ' + os.path.basename(f))
+        self.renamed = self.RenameFiles(self.files)
 
         return self.renamed
 
+    def Scan(self, directory):
+        """
+        Source files anywhere under `directory` (sorted), in a single pass;
+        hidden directories and `__pycache__` are skipped
+        """
+        files = []
+        directories = [directory]
+
+        while directories:
+            try:
+                entries = os.scandir(directories.pop())
+            except FileNotFoundError:
+                # Languages without skeleton code (e.g. AVR) have no source directory yet
+                continue
+
+            with entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not entry.name.startswith('.') and entry.name != '__pycache__':
+                            directories.append(entry.path)
+                    elif entry.name.endswith(self.suffixes):
+                        files.append(entry.path)
+
+        return sorted(files)
+
+    def RenameFiles(self, files):
+        """
+        Rename files according to the project name, as a single batch: nothing
+        is renamed if any new name is taken; returns the new paths
+        """
+        renames = [(filepath, self.RenamedPath(filepath)) for filepath in files]
+
+        targets = set()
+        for old, new in renames:
+            # Already renamed by an earlier `rocket config`
+            if new == old:
+                continue
+
+            # Case-only renames on case-insensitive filesystems find the file itself
+            if new in targets or (os.path.lexists(new) and not os.path.samefile(old, new)):
+                raise Exception('Cannot rename \'' + old + '\' to \'' + new + '\': Already exists')
+            targets.add(new)
+
+        for old, new in renames:
+            if new != old:
+                self.writer.Rename(old, new)
+
+        return [new for old, new in renames]
+
     def RenameFile(self, filepath):
         """
         Rename an individual file according to the project name
         """
-        new_name = filepath.replace('rocket', self.name)
+        return self.RenameFiles([filepath])[0]
+
+    def RenamedPath(self, filepath):
+        """
+        Path an individual file is renamed to, without touching the disk; only
+        the file name changes, never the directories it is in
+        """
+        directory, filename = os.path.split(filepath)
+        filename = filename.replace('rocket', self.name)
 
         if not self.language_configuration.extension:
             for s in self.language_configuration.sources:
-                print('\t> Dropping \'' + s + '\' extension')
-                new_name = new_name.replace(s, '')
-
-        os.rename(filepath, new_name)
+                filename = filename.replace(s, '')
 
-        return new_name
+        return os.path.join(directory, filename)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+
+#   Rocket - Naming
+#
+#   Joe Gibson (gibsjose@mail.gvsu.edu)
+#
+#   17 August 2015
+#
+#   http://gibsjose.com
+#   http://github.com/gibsjose/Rocket
+
+# Essential Modules
+import re
+import functools
+
+# Naming conventions
+#   - 'dashes': 'Rocket Project' -> 'rocket-project'
+#   - 'underscores': 'Rocket Project' -> 'rocket_project'
+#   - 'camel-case': 'Rocket Project' -> 'RocketProject'
+#   - 'guard': 'Rocket Project' -> 'ROCKET_PROJECT_H' (C/C++ header guards)
+Conventions = ['dashes', 'underscores', 'camel-case', 'guard']
+
+# Runs of letters and digits; everything else (spaces, punctuation, `_`) separates words
+WordExpression = re.compile(r'[^\W_]+')
+
+# Word boundaries inside a run: 'myProject' -> 'my|Project', 'HTTPServer' -> 'HTTP|Server'
+CaseExpression = re.compile(r'(?<=[a-z0-9])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])')
+
+# Number of names kept converted
+CacheSize = 4096
+
+@functools.lru_cache(maxsize=CacheSize)
+def Words(name):
+    """
+    Words of a name, as a tuple: 'My HTTPServer_v2' -> ('My', 'HTTP', 'Server', 'v2')
+    """
+    words = []
+    for run in WordExpression.findall(name):
+        words.extend(CaseExpression.split(run))
+
+    return tuple(words)
+
+@functools.lru_cache(maxsize=CacheSize)
+def Convert(name, convention):
+    """
+    Name converted to a naming convention (see `Conventions`)
+    """
+    words = Words(name)
+    if not words:
+        raise Exception('Cannot name files after \'' + name + '\': It has no letters or digits')
+
+    if convention == 'dashes':
+        return '-'.join(words).lower()
+
+    elif convention == 'underscores':
+        return '_'.join(words).lower()
+
+    elif convention == 'camel-case':
+        return ''.join(word.capitalize() for word in words)
+
+    elif convention == 'guard':
+        guard = '_'.join(words).upper() + '_H'
+
+        # Identifiers cannot start with a digit
+        if guard[0].isdigit():
+            guard = '_' + guard
+
+        return guard
+
+    raise Exception('Unknown naming convention \'' + str(convention) + '\': Must be one of ' + ', '.join(Conventions))
+
+def ConvertAll(names, convention):
+    """
+    Many names converted to a naming convention at once, as a list in the
+    same order; each distinct name is only converted once, and names that
+    cannot be converted (no letters or digits) give None instead of failing
+    the whole list
+    """
+    if convention not in Conventions:
+        raise Exception('Unknown naming convention \'' + str(convention) + '\': Must be one of ' + ', '.join(Conventions))
+
+    converted = {}
+    for name in names:
+        if name not in converted:
+            converted[name] = Convert(name, convention) if Words(name) else None
+
+    return [converted[name] for name in names]
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+
+#   Rocket - Profiler
+#
+#   Joe Gibson (gibsjose@mail.gvsu.edu)
+#
+#   17 August 2015
+#
+#   http://gibsjose.com
+#   http://github.com/gibsjose/Rocket
+
+# Essential Modules
+import os
+import time
+import _thread
+
+class Phase:
+    """
+    Context manager recording wall time, CPU time (including waited-for
+    subprocesses), bytes read/written and subprocesses spawned inside it
+    """
+    def __init__(self, profiler, name, filepath=None):
+        """
+        Sets the profiler, phase name and (optional) file the phase works on
+        """
+        self.profiler = profiler
+        self.name = name
+        self.filepath = filepath
+
+    def __enter__(self):
+        if self.profiler.enabled:
+            self.depth = self.profiler.Depth()
+            self.profiler.local.depth = self.depth + 1
+            self.start = self.profiler.Sample()
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        if self.profiler.enabled:
+            end = self.profiler.Sample()
+            self.profiler.local.depth = self.depth
+            self.profiler.records.append({
+                'name': self.name,
+                'file': self.filepath,
+                'depth': self.depth,
+                'thread': _thread.get_ident(),
+                'start': self.start[0] - self.profiler.origin,
+                'wall': end[0] - self.start[0],
+                'cpu': end[1] - self.start[1],
+                'read': end[2] - self.start[2],
+                'written': end[3] - self.start[3],
+                'subprocesses': end[4] - self.start[4]
+            })
+
+        return False
+
+class Profiler:
+    """
+    Collects per-phase timings and I/O counters for `--profile` and `--trace`
+
+    Every thread counts its own I/O, so a worker's phases only show what that
+    worker read and wrote. Phases of the main thread enclose the workers they
+    start, so they count the I/O of every thread (and of worker processes,
+    once their records are added with `Add`).
+    """
+    def __init__(self):
+        """
+        Default constructor: disabled until `Enable()` is called
+        """
+        self.enabled = False
+        self.records = []
+        self.local = _thread._local()
+        self.lock = _thread.allocate_lock()
+        self.main = _thread.get_ident()
+        self.totals = [0, 0, 0]
+        self.origin = time.perf_counter()
+
+    def Enable(self):
+        """
+        Start recording phases
+        """
+        self.enabled = True
+        self.main = _thread.get_ident()
+        self.origin = time.perf_counter()
+
+    def Worker(self, origin):
+        """
+        Start recording in a worker process, with the parent's `origin`; its
+        phases are nested one level deep, under the phase that started it
+        """
+        self.enabled = True
+        self.records = []
+        self.local = _thread._local()
+        self.local.depth = 1
+        self.main = None
+        self.totals = [0, 0, 0]
+        self.origin = origin
+
+    def Take(self):
+        """
+        Records taken so far, which a worker process sends back to its parent
+        """
+        records = self.records
+        self.records = []
+        return records
+
+    def Add(self, records):
+        """
+        Add the records of a worker process, counting the I/O of its outermost phases
+        """
+        with self.lock:
+            self.records.extend(records)
+            for record in records:
+                if record['depth'] == 1:
+                    self.totals[0] += record['read']
+                    self.totals[1] += record['written']
+                    self.totals[2] += record['subprocesses']
+
+    def Counters(self):
+        """
+        `[read, written, subprocesses]` counters of the current thread
+        """
+        counters = getattr(self.local, 'counters', None)
+        if counters is None:
+            counters = self.local.counters = [0, 0, 0]
+
+        return counters
+
+    def Count(self, index, amount):
+        """
+        Add `amount` to a counter (see `Counters`) of the current thread and to the totals
+        """
+        self.Counters()[index] += amount
+        with self.lock:
+            self.totals[index] += amount
+
+    def Depth(self):
+        """
+        Nesting depth of the current thread; worker threads start nested one
+        level deep, under the phase that started them
+        """
+        return getattr(self.local, 'depth', 0 if _thread.get_ident() == self.main else 1)
+
+    def Sample(self):
+        """
+        Current `(wall, cpu, read, written, subprocesses)` counters, of the
+        whole process on the main thread and of the current thread otherwise
+        """
+        if _thread.get_ident() == self.main:
+            times = os.times()
+            cpu = times.user + times.system + times.children_user + times.children_system
+            with self.lock:
+                read, written, subprocesses = self.totals
+        else:
+            cpu = time.thread_time()
+            read, written, subprocesses = self.Counters()
+
+        return (time.perf_counter(), cpu, read, written, subprocesses)
+
+    def Summary(self):
+        """
+        Print every recorded phase, in order, as a table
+        """
+        print('\n' + 'Phase'.ljust(48) + 'Wall ms'.rjust(10) + 'CPU ms'.rjust(10) + 'Read'.rjust(10) + 'Written'.rjust(10) + 'Procs'.rjust(7))
+
+        totals = [0.0, 0.0, 0, 0, 0]
+        for record in sorted(self.records, key=lambda record: record['start']):
+            name = '  ' * record['depth'] + record['name']
+            if record['file']:
+                name += ': ' + os.path.basename(record['file'])
+
+            print(name[:47].ljust(48) +
+                  ('%.2f' % (record['wall'] * 1000)).rjust(10) +
+                  ('%.2f' % (record['cpu'] * 1000)).rjust(10) +
+                  str(record['read']).rjust(10) +
+                  str(record['written']).rjust(10) +
+                  str(record['subprocesses']).rjust(7))
+
+            if record['depth'] == 0:
+                totals = [totals[0] + record['wall'], totals[1] + record['cpu'], totals[2] + record['read'],
+                          totals[3] + record['written'], totals[4] + record['subprocesses']]
+
+        print('Total'.ljust(48) +
+              ('%.2f' % (totals[0] * 1000)).rjust(10) +
+              ('%.2f' % (totals[1] * 1000)).rjust(10) +
+              str(totals[2]).rjust(10) +
+              str(totals[3]).rjust(10) +
+              str(totals[4]).rjust(7))
+
+    def Trace(self, filepath):
+        """
+        Export the recorded phases as a Chrome trace (`chrome://tracing`, Perfetto)
+        """
+        # Only needed for `--trace`, so not imported with the module
+        import json
+
+        events = []
+        for record in self.records:
+            args = {
+                'cpu_ms': record['cpu'] * 1000,
+                'bytes_read': record['read'],
+                'bytes_written': record['written'],
+                'subprocesses': record['subprocesses']
+            }
+            if record['file']:
+                args['file'] = record['file']
+
+            events.append({
+                'name': record['name'],
+                'cat': 'rocket',
+                'ph': 'X',
+                'ts': record['start'] * 1000000,
+                'dur': record['wall'] * 1000000,
+                'pid': os.getpid(),
+                'tid': record['thread'],
+                'args': args
+            })
+
+        with open(filepath, 'w') as trace_file:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, trace_file, indent=1)
+
+# The profiler shared by every Rocket module
+Current = Profiler()
+
+def Record(name, filepath=None):
+    """
+    Context manager for a phase of the current profiler: `with rocket.profiler.Record('decode'): ...`
+    """
+    return Phase(Current, name, filepath)
+
+def Read(size):
+    """
+    Count bytes read from project or template files
+    """
+    Current.Count(0, size)
+
+def Written(size):
+    """
+    Count bytes written to generated files
+    """
+    Current.Count(1, size)
+
+def Subprocess():
+    """
+    Count a spawned subprocess
+    """
+    Current.Count(2, 1)
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+
+#   Rocket - Registry
+#
+#   Joe Gibson (gibsjose@mail.gvsu.edu)
+#
+#   17 August 2015
+#
+#   http://gibsjose.com
+#   http://github.com/gibsjose/Rocket
+
+# Essential Modules
+import os
+
+# Local Modules
+from rocket.language import Language
+import rocket.configuration
+
+class LanguageEntry:
+    """
+    Everything Rocket needs to know about one `languages/<name>/` directory
+    """
+    def __init__(self, name, directory, configuration):
+        """
+        Sets the language name, its template directory and its `LanguageConfiguration`
+        """
+        self.name = name
+        self.directory = directory
+        self.configuration = configuration
+
+        # Built-in languages keep their enum value, others are `Language.unknown`
+        self.language = Language.__members__.get(name.replace('-', '_'), Language.unknown)
+
+        # Skeleton files, relative to `skeleton/`
+        if configuration.skeleton is not None:
+            self.skeleton = list(configuration.skeleton)
+        else:
+            self.skeleton = []
+            skeleton_directory = os.path.join(directory, 'skeleton')
+            for root, dirs, files in os.walk(skeleton_directory):
+                dirs.sort()
+                for f in sorted(files):
+                    self.skeleton.append(os.path.relpath(os.path.join(root, f), skeleton_directory))
+
+        # Optional makefile and `.gitignore`
+        self.makefile = os.path.join(directory, 'makefile')
+        if not os.path.exists(self.makefile):
+            self.makefile = None
+
+        self.gitignore = os.path.join(directory, name + '.gitignore')
+        if not os.path.exists(self.gitignore):
+            self.gitignore = None
+
+class Registry:
+    """
+    Index of the languages found in the Rocket `languages/` directory
+
+    Adding a language only needs a new `languages/<name>/` directory. The index
+    is kept in the cache and rebuilt only when the directory tree changes.
+    """
+    def __init__(self, directory, cache=None):
+        """
+        Sets the `languages/` directory and the (optional) cache
+        """
+        self.directory = directory
+        self.cache = cache
+        self.languages = {}
+        self.aliases = {}
+        self.signature = None
+
+    def Load(self):
+        """
+        Load the index from the cache, or scan the `languages/` directory; the
+        `signature` it was loaded with is kept
+        """
+        self.signature = self.Signature()
+        if self.cache:
+            self.languages, self.aliases = self.cache.Load('registry', self.directory, self.signature, self.Scan)
+        else:
+            self.languages, self.aliases = self.Scan()
+
+        return self
+
+    def Signature(self):
+        """
+        Modification times of every directory and `language.json` in the tree,
+        which change whenever a language or skeleton file is added or removed
+        """
+        signature = []
+        for root, dirs, files in os.walk(self.directory):
+            dirs.sort()
+            signature.append((root, os.stat(root).st_mtime_ns))
+            if 'language.json' in files:
+                path = os.path.join(root, 'language.json')
+                signature.append((path, os.stat(path).st_mtime_ns))
+
+        return signature
+
+    def Scan(self):
+        """
+        Build `(languages, aliases)` from the `languages/` directory
+        """
+        languages = {}
+        aliases = {}
+
+        for name in sorted(os.listdir(self.directory)):
+            directory = os.path.join(self.directory, name)
+            if not os.path.isdir(directory):
+                continue
+
+            configuration = rocket.configuration.LanguageConfiguration()
+            configuration.Decode(os.path.join(directory, 'language.json'))
+
+            languages[name] = LanguageEntry(name, directory, configuration)
+
+            aliases[name.lower()] = name
+            if 'language' in configuration.data:
+                aliases[configuration.data['language'].lower()] = name
+            for alias in configuration.aliases:
+                aliases[alias] = name
+
+        return languages, aliases
+
+    def Find(self, language):
+        """
+        `LanguageEntry` for a language name or alias (case-insensitive), or None
+        """
+        name = self.aliases.get(language.lower())
+        if name is None:
+            return None
+
+        return self.languages[name]
+
+    def Names(self):
+        """
+        Sorted list of every accepted language name and alias
+        """
+        return sorted(self.aliases)
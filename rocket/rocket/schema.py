@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+
+#   Rocket - Schema
+#
+#   Joe Gibson (gibsjose@mail.gvsu.edu)
+#
+#   17 August 2015
+#
+#   http://gibsjose.com
+#   http://github.com/gibsjose/Rocket
+
+# Names of the JSON types, for error messages
+TypeNames = {str: 'a string', bool: 'true or false', int: 'a number', list: 'a list', dict: 'an object'}
+
+class Field:
+    """
+    Declares one attribute of a JSON object: its type, whether it is required,
+    its default, the object attribute it is stored in, and for lists and
+    objects the schema of their items or fields
+    """
+    def __init__(self, kind, required=False, default=None, attribute=None, convert=None,
+                 items=None, fields=None, choices=None, minimum=None):
+        """
+        Sets the field's declaration
+        """
+        self.kind = kind
+        self.required = required
+        self.default = default
+        self.attribute = attribute
+        self.convert = convert
+        self.items = items
+        self.fields = fields
+        self.choices = choices
+        self.minimum = minimum
+
+class Schema:
+    """
+    Schema of a JSON object, as `{name: Field}`
+
+    The schema is compiled once into a list of checks, which validate a whole
+    object and report every error at once.
+    """
+    def __init__(self, fields):
+        """
+        Sets the fields and compiles the validator
+        """
+        self.fields = fields
+        self.validator = self.Compile(Field(dict, fields=fields))
+
+    def Compile(self, field):
+        """
+        Validator for a field, called as `validator(value, path, errors)`
+        """
+        kind = field.kind
+        name = TypeNames[kind]
+        checks = []
+
+        if field.choices is not None:
+            choices = set(field.choices)
+            message = ': Must be one of ' + ', '.join(field.choices)
+            checks.append(lambda value, path, errors: value in choices or errors.append(path + message))
+
+        if field.minimum is not None:
+            minimum = field.minimum
+            if kind is list:
+                message = ': Must have at least ' + str(minimum) + ' item(s)'
+                checks.append(lambda value, path, errors: len(value) >= minimum or errors.append(path + message))
+            else:
+                message = ': Must be at least ' + str(minimum)
+                checks.append(lambda value, path, errors: value >= minimum or errors.append(path + message))
+
+        if field.items is not None:
+            item = self.Compile(field.items)
+
+            def Items(value, path, errors):
+                for index, entry in enumerate(value):
+                    item(entry, path + '[' + str(index) + ']', errors)
+
+            checks.append(Items)
+
+        if field.fields is not None:
+            members = [(key, member.required, self.Compile(member)) for key, member in field.fields.items()]
+
+            def Members(value, path, errors):
+                for key, required, member in members:
+                    if key in value:
+                        member(value[key], path + '.' + key if path else key, errors)
+                    elif required:
+                        errors.append((path + ': ' if path else '') + 'Must specify \'' + key + '\'')
+
+            checks.append(Members)
+
+        def Validate(value, path, errors):
+            # `bool` is a subclass of `int`, but never a valid number here
+            if not isinstance(value, kind) or (kind is int and isinstance(value, bool)):
+                errors.append((path or 'The file') + ': Must be ' + name)
+                return
+
+            for check in checks:
+                check(value, path, errors)
+
+        return Validate
+
+    def Validate(self, data):
+        """
+        List of every error in `data` (empty if it is valid)
+        """
+        errors = []
+        self.validator(data, '', errors)
+        return errors
+
+    def Apply(self, target, data):
+        """
+        Set each field with an `attribute` on `target`, from `data` or the field's default
+        """
+        for key, field in self.fields.items():
+            if field.attribute is None:
+                continue
+
+            if key in data:
+                value = data[key]
+                if field.convert is not None:
+                    value = field.convert(value)
+            elif isinstance(field.default, (list, dict)):
+                value = type(field.default)(field.default)
+            else:
+                value = field.default
+
+            setattr(target, field.attribute, value)
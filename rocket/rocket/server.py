@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+
+#   Rocket - Server
+#
+#   Joe Gibson (gibsjose@mail.gvsu.edu)
+#
+#   17 August 2015
+#
+#   http://gibsjose.com
+#   http://github.com/gibsjose/Rocket
+
+# Essential Modules
+import os
+import io
+import stat
+import signal
+import contextlib
+import socketserver
+
+# Other Modules
+import json         # JSON
+
+# Local Modules
+import rocket.client
+
+# JSON-RPC 2.0 error codes
+ParseError = -32700
+InvalidRequest = -32600
+MethodNotFound = -32601
+RequestFailed = -32000
+
+class ForkingServer(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+    """
+    Unix socket server handling each connection in a child process forked
+    from the warm daemon, so requests run concurrently and each has its
+    own working directory and stdout
+    """
+    pass
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    """
+    Reads one JSON-RPC request per line and writes one response per line
+    """
+    def handle(self):
+        for line in self.rfile:
+            response = self.server.rocket.Dispatch(line)
+            self.wfile.write((json.dumps(response) + '\n').encode('utf-8'))
+            self.wfile.flush()
+
+class Server:
+    """
+    The `rocket serve` daemon: runs `create` and `config` requests from a
+    local Unix socket while keeping the language registry and parsed
+    templates in memory
+
+    Methods:
+      - 'ping': Returns the daemon's pid
+      - 'create', 'config': Calls `handler(method, params)`, returning its result and the printed `output`
+      - 'shutdown': Stops the daemon
+    """
+    def __init__(self, path, handler):
+        """
+        Sets the socket path and the function running `create`/`config` requests
+        """
+        self.path = path
+        self.handler = handler
+        self.pid = os.getpid()
+
+    def Serve(self):
+        """
+        Listen until stopped with `shutdown`, SIGTERM or Ctrl-C
+        """
+        with rocket.client.Client(self.path) as client:
+            if client.Connect():
+                raise Exception('A rocket daemon is already listening on \'' + self.path + '\'')
+
+        # The default socket directory in `/tmp` is private to this user
+        directory = os.path.dirname(os.path.abspath(self.path))
+        if directory == rocket.client.PrivateDirectory():
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+            status = os.lstat(directory)
+            if not stat.S_ISDIR(status.st_mode) or status.st_uid != os.getuid() or status.st_mode & 0o077:
+                raise Exception('Not using \'' + directory + '\' for the socket: It must be a directory only you can access')
+
+        # Left behind by a daemon that did not exit cleanly
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+        # Only this user may connect
+        umask = os.umask(0o077)
+        try:
+            server = ForkingServer(self.path, RequestHandler)
+        finally:
+            os.umask(umask)
+
+        server.rocket = self
+        signal.signal(signal.SIGTERM, self.Stop)
+
+        try:
+            print('\t> Listening on ' + self.path)
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+        print('\t> Stopped')
+
+    def Stop(self, signum, frame):
+        """
+        SIGTERM handler
+        """
+        raise KeyboardInterrupt
+
+    def Dispatch(self, line):
+        """
+        Run a single request and return its response
+        """
+        try:
+            request = json.loads(line.decode('utf-8'))
+        except ValueError as e:
+            return self.Error(None, ParseError, 'Invalid JSON: ' + str(e))
+
+        if not isinstance(request, dict) or not isinstance(request.get('method'), str):
+            return self.Error(None, InvalidRequest, 'Must be a JSON-RPC request object')
+
+        request_id = request.get('id')
+        method = request['method']
+        params = request.get('params') or {}
+
+        if method == 'ping':
+            return self.Result(request_id, {'pid': self.pid})
+
+        elif method == 'shutdown':
+            os.kill(self.pid, signal.SIGTERM)
+            return self.Result(request_id, {})
+
+        elif method not in ('create', 'config'):
+            return self.Error(request_id, MethodNotFound, 'Unknown method \'' + method + '\'')
+
+        output = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(output):
+                result = self.handler(method, params)
+        except Exception as e:
+            return self.Error(request_id, RequestFailed, str(e), {'output': output.getvalue()})
+
+        result['output'] = output.getvalue()
+        return self.Result(request_id, result)
+
+    def Result(self, request_id, result):
+        """
+        Successful response
+        """
+        return {'jsonrpc': '2.0', 'id': request_id, 'result': result}
+
+    def Error(self, request_id, code, message, data=None):
+        """
+        Error response
+        """
+        error = {'code': code, 'message': message}
+        if data is not None:
+            error['data'] = data
+
+        return {'jsonrpc': '2.0', 'id': request_id, 'error': error}
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+
+#   Rocket - State
+#
+#   Joe Gibson (gibsjose@mail.gvsu.edu)
+#
+#   17 August 2015
+#
+#   http://gibsjose.com
+#   http://github.com/gibsjose/Rocket
+
+# Essential Modules
+import os
+import hashlib
+
+# Other Modules
+import json         # JSON
+
+def Digest(text):
+    """
+    sha1 of a file's text, as stored in the state file
+    """
+    if isinstance(text, str):
+        text = text.encode('utf-8')
+
+    return hashlib.sha1(text).hexdigest()
+
+def FileDigest(filepath, size=1 << 20):
+    """
+    sha1 of a file's contents, read in chunks of `size` bytes
+    """
+    digest = hashlib.sha1()
+    with open(filepath, 'rb') as in_file:
+        for chunk in iter(lambda: in_file.read(size), b''):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+class State:
+    """
+    What `rocket config` generated last time, kept in `.rocket.json` in the project
+
+    For every generated file it records where its template came from in the
+    language directory, the template and output hashes, and the tag values
+    the template used. A later `rocket config` can then re-render an untouched
+    file from its original template, skip it when none of its inputs changed,
+    and leave files the user has edited alone.
+
+    The text of each original template is kept too (by hash, under
+    'templates'), so untouched files are still re-rendered after the
+    language's copy changes. Streamed files keep theirs in the cache instead.
+    """
+    # Name of the state file in the project directory
+    filename = '.rocket.json'
+
+    # Bump whenever the layout of the state file changes
+    version = 1
+
+    def __init__(self, directory, language_directory):
+        """
+        Sets the project directory and the language directory templates are read from
+        """
+        self.directory = directory
+        self.language_directory = language_directory
+        self.path = os.path.join(directory, self.filename)
+        self.data = {'version': self.version, 'date': None, 'files': {}}
+        self.origins = {}
+
+    def Load(self):
+        """
+        Read the state file; a missing or unreadable file is an empty state
+        """
+        try:
+            with open(self.path, encoding='utf-8') as state_file:
+                data = json.load(state_file)
+        except (OSError, ValueError):
+            return self
+
+        if isinstance(data, dict) and data.get('version') == self.version:
+            self.data = data
+
+        return self
+
+    def Save(self, writer):
+        """
+        Write the state file (only if it changed)
+        """
+        # Only keep the templates files are still rendered from
+        templates = self.data.get('templates')
+        if templates is not None:
+            used = set(entry['template'] for entry in self.data['files'].values() if entry['source'])
+            self.data['templates'] = {digest: text for digest, text in templates.items() if digest in used}
+
+        writer.Update(self.path, json.dumps(self.data, sort_keys=True, indent=4) + '\n')
+
+    def Key(self, filepath):
+        """
+        State key of a file: its path relative to the project directory
+        """
+        return os.path.relpath(filepath, self.directory)
+
+    def Manifest(self):
+        """
+        Files `rocket create` made, as `{path relative to the project: file it
+        was copied from in the language directory, or None}`, or None for
+        projects created without a manifest
+        """
+        return self.data.get('manifest')
+
+    def Created(self, filepath, source=None):
+        """
+        Add a new project file to the manifest
+        """
+        self.data.setdefault('manifest', {})[self.Key(filepath)] = source
+
+    def Moved(self, old, new):
+        """
+        Follow a renamed project file in the manifest
+        """
+        manifest = self.data.get('manifest')
+        if manifest is not None and self.Key(old) in manifest:
+            manifest[self.Key(new)] = manifest.pop(self.Key(old))
+
+    def Origin(self, filepath, source):
+        """
+        Note the file (relative to the language directory) a new project file
+        was copied from, if it is still an unchanged copy of it; a file edited
+        before its first `rocket config` has no origin and is never re-rendered
+        """
+        try:
+            if FileDigest(filepath) != FileDigest(os.path.join(self.language_directory, source)):
+                return
+        except OSError:
+            return
+
+        self.origins[self.Key(filepath)] = source
+
+    def Source(self, filepath, digest):
+        """
+        Path of the original template of a project file whose contents hash to
+        `digest`, and its state entry, or `(None, None)` if the file is not
+        exactly what Rocket generated last time
+
+        The caller still has to check the template against `entry['template']`.
+        """
+        entry = self.data['files'].get(self.Key(filepath))
+        if entry is None or not entry['source'] or entry['output'] != digest:
+            return None, None
+
+        return os.path.join(self.language_directory, entry['source']), entry
+
+    def Template(self, filepath, text):
+        """
+        Template text for a project file currently containing `text`, and its state entry
+
+        If the file is exactly what Rocket generated last time and its original
+        template is still available (kept in the state file, or unchanged in
+        the language directory), that template and the entry are returned.
+        Otherwise the file's own text is the template and the entry is None.
+        """
+        path, entry = self.Source(filepath, Digest(text))
+        if path is None:
+            return text, None
+
+        template = self.data.get('templates', {}).get(entry['template'])
+        if template is not None:
+            return template, entry
+
+        try:
+            with open(path, encoding='utf-8') as source_file:
+                template = source_file.read()
+        except OSError:
+            template = None
+
+        if template is None or Digest(template) != entry['template']:
+            Frozen(filepath)
+            return text, None
+
+        return template, entry
+
+    def Record(self, filepath, template, inputs, output, entry=None, text=None):
+        """
+        Record the template and output hashes and the tag values a file was
+        generated from, and the template `text` if the file has an original template
+        """
+        key = self.Key(filepath)
+        if entry is not None:
+            source = entry['source']
+        else:
+            source = self.origins.get(key)
+
+        self.data['files'][key] = {
+            'source': source,
+            'template': template,
+            'inputs': inputs,
+            'output': output
+        }
+
+        if source and text is not None:
+            self.data.setdefault('templates', {})[template] = text
+
+def Frozen(filepath):
+    """
+    Warn that an untouched file's original template is gone, so it is left as it is from now on
+    """
+    print('\t* Warning: \'' + os.path.basename(filepath) + '\' is no longer configured: Its original template changed and was not kept')
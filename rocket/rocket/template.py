@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+
+#   Rocket - Template
+#
+#   Joe Gibson (gibsjose@mail.gvsu.edu)
+#
+#   17 August 2015
+#
+#   http://gibsjose.com
+#   http://github.com/gibsjose/Rocket
+
+# Essential Modules
+import re
+
+# Local Modules
+import rocket.naming
+
+# Matches every comment tag that can appear in a skeleton file
+TagExpression = re.compile(r'\{(TITLE|DESCRIPTION|DD MONTH YYYY|AUTHOR-NAME|AUTHOR-EMAIL|LICENSE|WEBSITE|GUARD|HEADER)\}')
+
+# The same tags in raw bytes, for scanning large files without decoding them
+TagBytesExpression = re.compile(TagExpression.pattern.encode('ascii'))
+
+# Bytes copied at a time between tags when streaming
+ChunkSize = 1 << 20
+
+# Segment types
+#   - 'text': Lines without any tags, copied through as-is
+#   - 'line': A line with tags, rendered once
+#   - 'authors': A line repeated once per author
+#   - 'websites': A line repeated once per website
+#   - 'license': A line dropped when there is no license
+#   - 'description': A line dropped when there is no description
+TEXT = 'text'
+LINE = 'line'
+AUTHORS = 'authors'
+WEBSITES = 'websites'
+LICENSE = 'license'
+DESCRIPTION = 'description'
+
+class Context:
+    """
+    Tag values for a single project, computed once and shared by every file
+    """
+    def __init__(self, configuration, header):
+        """
+        Builds the tag values from a decoded configuration and the header file name
+        """
+        self.values = {
+            'TITLE': configuration.project,
+            'DD MONTH YYYY': configuration.date,
+            'DESCRIPTION': configuration.description,
+            'GUARD': rocket.naming.Convert(configuration.project, 'guard'),
+            'HEADER': header or '',
+            'LICENSE': self.License(configuration)
+        }
+
+        self.authors = []
+        for author in configuration.authors:
+            self.authors.append({
+                'AUTHOR-NAME': author['name'],
+                'AUTHOR-EMAIL': author.get('email', '')
+            })
+
+        self.websites = []
+        for website in configuration.websites:
+            self.websites.append({'WEBSITE': website})
+
+    def Inputs(self, tags):
+        """
+        The values a template using `tags` depends on, e.g. to tell whether re-rendering it can change anything
+        """
+        inputs = {tag: self.values[tag] for tag in tags if tag in self.values}
+
+        if ('AUTHOR-NAME' in tags) or ('AUTHOR-EMAIL' in tags):
+            inputs['AUTHORS'] = [[author['AUTHOR-NAME'], author['AUTHOR-EMAIL']] for author in self.authors]
+
+        if 'WEBSITE' in tags:
+            inputs['WEBSITES'] = [website['WEBSITE'] for website in self.websites]
+
+        return inputs
+
+    def License(self, configuration):
+        """
+        Formats the license line: 'License: MIT (http://...)', or '' if there is no license
+        """
+        if not configuration.license and not configuration.license_url:
+            return ''
+
+        if configuration.license and configuration.license_url:
+            return 'License: ' + configuration.license + ' (' + configuration.license_url + ')'
+
+        return 'License: ' + (configuration.license or configuration.license_url)
+
+class Template:
+    """
+    A skeleton file parsed once into segments, then rendered in memory
+    """
+    def __init__(self):
+        """
+        Default constructor
+        """
+        self.segments = []
+
+    def Parse(self, text):
+        """
+        Split the text into segments of tag-free text and tagged lines
+        """
+        self.segments = []
+        text_lines = []
+
+        for line in text.splitlines(keepends=True):
+            # Alternating literal strings and tag names, starting with a literal
+            parts = TagExpression.split(line)
+
+            if len(parts) == 1:
+                text_lines.append(line)
+                continue
+
+            if text_lines:
+                self.segments.append((TEXT, ''.join(text_lines)))
+                text_lines = []
+
+            tags = parts[1::2]
+            if ('AUTHOR-NAME' in tags) or ('AUTHOR-EMAIL' in tags):
+                kind = AUTHORS
+            elif 'WEBSITE' in tags:
+                kind = WEBSITES
+            elif 'LICENSE' in tags:
+                kind = LICENSE
+            elif 'DESCRIPTION' in tags:
+                kind = DESCRIPTION
+            else:
+                kind = LINE
+
+            self.segments.append((kind, tuple(parts)))
+
+        if text_lines:
+            self.segments.append((TEXT, ''.join(text_lines)))
+
+        return self
+
+    def Tags(self):
+        """
+        Set of tag names used anywhere in the template
+        """
+        tags = set()
+        for kind, value in self.segments:
+            if kind != TEXT:
+                tags.update(value[1::2])
+
+        return tags
+
+    def Render(self, context):
+        """
+        Render the template against a `Context` and return the resulting text
+        """
+        out = []
+
+        for kind, value in self.segments:
+            if kind == TEXT:
+                out.append(value)
+
+            elif kind == AUTHORS:
+                for author in context.authors:
+                    out.append(self.RenderLine(value, context.values, author))
+
+            elif kind == WEBSITES:
+                for website in context.websites:
+                    out.append(self.RenderLine(value, context.values, website))
+
+            elif kind == LICENSE:
+                if context.values['LICENSE']:
+                    out.append(self.RenderLine(value, context.values))
+
+            elif kind == DESCRIPTION:
+                if context.values['DESCRIPTION']:
+                    out.append(self.RenderLine(value, context.values))
+
+            else:
+                out.append(self.RenderLine(value, context.values))
+
+        return ''.join(out)
+
+    def RenderLine(self, parts, values, extra=None):
+        """
+        Join a tagged line's parts, substituting tag names with their values
+        """
+        line = []
+        for i, part in enumerate(parts):
+            if i % 2 == 0:
+                line.append(part)
+            elif extra and part in extra:
+                line.append(extra[part])
+            else:
+                line.append(values.get(part, ''))
+
+        return ''.join(line)
+
+class StreamTemplate:
+    """
+    A large skeleton file rendered straight from a buffer (e.g. an mmap of
+    the file) in constant memory: tag-free regions are copied through in
+    chunks, and only lines containing tags are decoded and rendered
+    """
+    def __init__(self, buffer):
+        """
+        Sets the buffer (bytes or mmap) holding the template
+        """
+        self.buffer = buffer
+        self.lines = None
+
+    def Lines(self):
+        """
+        `(start, end)` offsets of every line with a tag, including its newline
+        """
+        if self.lines is None:
+            self.lines = []
+            for match in TagBytesExpression.finditer(self.buffer):
+                if self.lines and match.start() < self.lines[-1][1]:
+                    continue
+
+                start = self.buffer.rfind(b'\n', 0, match.start()) + 1
+                end = self.buffer.find(b'\n', match.end())
+                end = len(self.buffer) if end == -1 else end + 1
+                self.lines.append((start, end))
+
+        return self.lines
+
+    def Line(self, start, end):
+        """
+        A tagged line parsed as a single-line `Template`
+        """
+        return Template().Parse(self.buffer[start:end].decode('utf-8', 'surrogateescape'))
+
+    def Tags(self):
+        """
+        Set of tag names used anywhere in the template
+        """
+        tags = set()
+        for start, end in self.Lines():
+            tags.update(self.Line(start, end).Tags())
+
+        return tags
+
+    def Render(self, context, write):
+        """
+        Render the template against a `Context`, passing the output bytes to `write` piece by piece
+        """
+        position = 0
+        for start, end in self.Lines():
+            self.Copy(position, start, write)
+            write(self.Line(start, end).Render(context).encode('utf-8', 'surrogateescape'))
+            position = end
+
+        self.Copy(position, len(self.buffer), write)
+
+    def Copy(self, start, end, write):
+        """
+        Pass the untouched bytes between `start` and `end` to `write`, one chunk at a time
+        """
+        while start < end:
+            stop = min(end, start + ChunkSize)
+            write(self.buffer[start:stop])
+            start = stop
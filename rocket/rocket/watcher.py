@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+
+#   Rocket - Watcher
+#
+#   Joe Gibson (gibsjose@mail.gvsu.edu)
+#
+#   17 August 2015
+#
+#   http://gibsjose.com
+#   http://github.com/gibsjose/Rocket
+
+# Essential Modules
+import os
+import time
+import errno
+import select
+import struct
+import ctypes
+
+# inotify(7) event masks
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+
+# Events that mean a file was written, replaced, added or removed
+WatchMask = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+# Header of each `struct inotify_event`: wd, mask, cookie, len (the name follows)
+EventHeader = struct.Struct('iIII')
+
+# Seconds without any change before a burst of changes counts as done
+Debounce = 0.2
+
+# Seconds between checks of the polling fallback
+PollInterval = 0.5
+
+class Inotify:
+    """
+    Waits for changes with Linux inotify, called through `ctypes`
+
+    Watches `(directory, names)` pairs: only the files called `names` in
+    `directory`, or if `names` is None, everything under `directory`
+    (including directories created later).
+    """
+    def __init__(self, paths):
+        """
+        Sets up the watches; raises `OSError` where inotify is not available
+        """
+        try:
+            self.libc = ctypes.CDLL(None, use_errno=True)
+            self.libc.inotify_init1
+            self.libc.inotify_add_watch
+        except (OSError, AttributeError):
+            raise OSError(errno.ENOSYS, 'inotify is not available')
+
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), os.strerror(ctypes.get_errno()))
+
+        # `{watch descriptor: (directory, names)}`
+        self.watches = {}
+
+        try:
+            for directory, names in paths:
+                if names is None:
+                    for root, dirs, files in os.walk(directory):
+                        self.Add(root, None)
+                else:
+                    self.Add(directory, set(names))
+        except OSError:
+            self.Close()
+            raise
+
+    def Add(self, directory, names):
+        """
+        Watch a single directory
+        """
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), WatchMask)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), os.strerror(ctypes.get_errno()), directory)
+
+        self.watches[wd] = (directory, names)
+
+    def Wait(self, timeout=None):
+        """
+        Wait up to `timeout` seconds (default: forever) for a change; returns
+        whether there was one
+        """
+        while True:
+            ready, _, _ = select.select([self.fd], [], [], timeout)
+            if not ready:
+                return False
+
+            changed = False
+            data = os.read(self.fd, 65536)
+            offset = 0
+            while offset < len(data):
+                wd, mask, cookie, length = EventHeader.unpack_from(data, offset)
+                name = os.fsdecode(data[offset + EventHeader.size:offset + EventHeader.size + length].rstrip(b'\0'))
+                offset += EventHeader.size + length
+
+                if mask & IN_Q_OVERFLOW:
+                    changed = True
+                    continue
+
+                if mask & IN_IGNORED or wd not in self.watches:
+                    continue
+
+                directory, names = self.watches[wd]
+                if names is not None and name not in names:
+                    continue
+
+                # New directories in a watched tree are watched too
+                if names is None and mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                    try:
+                        self.Add(os.path.join(directory, name), None)
+                    except OSError:
+                        pass
+
+                changed = True
+
+            if changed:
+                return True
+
+    def Close(self):
+        """
+        Stop watching
+        """
+        os.close(self.fd)
+
+class Poller:
+    """
+    Waits for changes by comparing the mtime, size and inode of the watched
+    files every `PollInterval` seconds, where inotify is not available (e.g.
+    other platforms, or network filesystems that do not report changes)
+    """
+    def __init__(self, paths, interval=PollInterval):
+        """
+        Sets the `(directory, names)` pairs to watch (see `Inotify`) and the polling interval
+        """
+        self.paths = paths
+        self.interval = interval
+        self.snapshot = self.Snapshot()
+
+    def Snapshot(self):
+        """
+        `{path: (mtime, size, inode)}` of every watched file and directory
+        """
+        snapshot = {}
+        for directory, names in self.paths:
+            if names is None:
+                filepaths = []
+                for root, dirs, files in os.walk(directory):
+                    filepaths.append(root)
+                    filepaths.extend(os.path.join(root, f) for f in files)
+            else:
+                filepaths = [os.path.join(directory, name) for name in names]
+
+            for filepath in filepaths:
+                try:
+                    stat = os.stat(filepath)
+                except OSError:
+                    continue
+                snapshot[filepath] = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+        return snapshot
+
+    def Wait(self, timeout=None):
+        """
+        Wait up to `timeout` seconds (default: forever) for a change; returns
+        whether there was one
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            delay = self.interval
+            if deadline is not None:
+                delay = min(delay, deadline - time.monotonic())
+                if delay <= 0:
+                    return False
+
+            time.sleep(delay)
+
+            snapshot = self.Snapshot()
+            if snapshot != self.snapshot:
+                self.snapshot = snapshot
+                return True
+
+    def Close(self):
+        """
+        Stop watching
+        """
+        pass
+
+def Watcher(paths, poll=False):
+    """
+    An `Inotify` watcher for the `(directory, names)` pairs, or a `Poller`
+    if `poll` is set or inotify is not available
+    """
+    if not poll:
+        try:
+            return Inotify(paths)
+        except OSError as e:
+            print('\t* Warning: Polling for changes: ' + (e.strerror or str(e)))
+
+    return Poller(paths)
+
+def Watch(paths, callback, poll=False, debounce=Debounce):
+    """
+    Call `callback()` after every burst of changes to the `(directory, names)`
+    pairs, once nothing has changed for `debounce` seconds; `callback`
+    returns the pairs to watch from then on. Runs until interrupted (e.g. Ctrl-C)
+    """
+    watcher = Watcher(paths, poll)
+    try:
+        while True:
+            watcher.Wait()
+            while watcher.Wait(debounce):
+                pass
+
+            changed = callback()
+            if changed != paths:
+                watcher.Close()
+                watcher = None
+                paths = changed
+                watcher = Watcher(paths, poll)
+    finally:
+        if watcher is not None:
+            watcher.Close()
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+
+#   Rocket - Writer
+#
+#   Joe Gibson (gibsjose@mail.gvsu.edu)
+#
+#   17 August 2015
+#
+#   http://gibsjose.com
+#   http://github.com/gibsjose/Rocket
+
+# Essential Modules
+import os
+import itertools
+
+# Local Modules
+import rocket.profiler
+
+# Available `fsync` modes
+#   - 'off': Never fsync (fastest, relies on the OS to flush)
+#   - 'file': fsync each file and its directory as soon as it is written
+#   - 'project': fsync everything written once, when `Sync()` is called
+SyncModes = ['off', 'file', 'project']
+
+def Umask():
+    """
+    The process umask, read without changing it where possible (Linux
+    `/proc`); otherwise it has to be set and restored
+    """
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('Umask:'):
+                    return int(line.split()[1], 8)
+    except (OSError, ValueError):
+        pass
+
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+# Default permissions for newly created files, as `open()` would use; read
+# once at import, so writers never touch the process-wide umask while other
+# threads may be creating files
+DefaultMode = 0o666 & ~Umask()
+
+class FileWriter:
+    """
+    Writes generated files atomically: each file is written to a temporary
+    file in the same directory and then moved over the destination with
+    `os.replace`, so readers never see a partially written file and no data
+    is copied between filesystems
+    """
+    def __init__(self, sync='off'):
+        """
+        Sets the fsync mode (see `SyncModes`)
+        """
+        if sync not in SyncModes:
+            raise Exception('Unknown fsync mode \'' + str(sync) + '\': Must be one of ' + ', '.join(SyncModes))
+
+        self.sync = sync
+        self.counter = itertools.count()
+        self.pending_files = []
+        self.pending_directories = set()
+        self.default_mode = DefaultMode
+
+    def __getstate__(self):
+        """
+        A writer sent to a worker process starts with its own counter and nothing pending
+        """
+        state = self.__dict__.copy()
+        del state['counter']
+        state['pending_files'] = []
+        state['pending_directories'] = set()
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.counter = itertools.count()
+
+    def Write(self, filepath, content, mode=None):
+        """
+        Atomically write `content` (str or bytes) to `filepath`
+
+        The file keeps its existing permissions unless `mode` is given.
+        """
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+
+        pending = self.Open(filepath, mode)
+        try:
+            pending.Write(content)
+        except BaseException:
+            pending.Discard()
+            raise
+
+        pending.Commit()
+
+    def Open(self, filepath, mode=None):
+        """
+        Start streaming new contents for `filepath` into a `PendingFile`, which
+        replaces the file atomically on `Commit()`
+
+        The file keeps its existing permissions unless `mode` is given.
+        """
+        if mode is None:
+            try:
+                mode = os.stat(filepath).st_mode & 0o7777
+            except FileNotFoundError:
+                mode = self.default_mode
+
+        directory = os.path.dirname(os.path.abspath(filepath))
+        fd, temp_path = self.TempFile(directory, os.path.basename(filepath))
+
+        return PendingFile(self, filepath, directory, os.fdopen(fd, 'wb'), temp_path, mode)
+
+    def Update(self, filepath, content, mode=None):
+        """
+        Write `content` only if it differs from what `filepath` already
+        contains, so unchanged files keep their mtime; returns True if written
+        """
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+
+        try:
+            with open(filepath, 'rb') as old_file:
+                if old_file.read() == content:
+                    return False
+        except FileNotFoundError:
+            pass
+
+        self.Write(filepath, content, mode)
+        return True
+
+    def TempFile(self, directory, name):
+        """
+        Exclusively create a hidden temporary file for `name` in `directory`, returning `(fd, path)`
+        """
+        while True:
+            temp_path = os.path.join(directory, '.' + name + '.' + str(os.getpid()) + '-' + str(next(self.counter)) + '.tmp')
+            try:
+                return os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600), temp_path
+            except FileExistsError:
+                # Left behind by an earlier process with the same pid
+                continue
+
+    def Rename(self, src, dst):
+        """
+        Rename `src` to `dst`, with the same durability guarantees as `Write`
+        """
+        os.rename(src, dst)
+        self.Written(dst, os.path.dirname(os.path.abspath(dst)))
+
+    def Written(self, filepath, directory):
+        """
+        Apply the fsync mode to a file that was just written
+        """
+        if self.sync == 'file':
+            self.SyncPath(directory)
+        elif self.sync == 'project':
+            self.pending_files.append(filepath)
+            self.pending_directories.add(directory)
+
+    def Sync(self):
+        """
+        fsync every file (and directory) written since the last call, in 'project' mode
+        """
+        for filepath in self.pending_files:
+            self.SyncPath(filepath)
+
+        for directory in sorted(self.pending_directories):
+            self.SyncPath(directory)
+
+        self.pending_files = []
+        self.pending_directories = set()
+
+    def SyncPath(self, path):
+        """
+        fsync a single file or directory
+        """
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+class PendingFile:
+    """
+    New contents of a file, written piece by piece to a temporary file next
+    to it, which either replaces the file (`Commit`) or is removed (`Discard`)
+    """
+    def __init__(self, writer, filepath, directory, temp_file, temp_path, mode):
+        """
+        Sets the `FileWriter`, the destination, the open temporary file and the final permissions
+        """
+        self.writer = writer
+        self.filepath = filepath
+        self.directory = directory
+        self.temp_file = temp_file
+        self.temp_path = temp_path
+        self.mode = mode
+
+    def Write(self, content):
+        """
+        Append bytes to the new contents
+        """
+        self.temp_file.write(content)
+        rocket.profiler.Written(len(content))
+
+    def Commit(self):
+        """
+        Move the new contents over the destination
+        """
+        try:
+            if self.writer.sync == 'file':
+                self.temp_file.flush()
+                os.fsync(self.temp_file.fileno())
+            self.temp_file.close()
+
+            os.chmod(self.temp_path, self.mode)
+            os.replace(self.temp_path, self.filepath)
+
+        except BaseException:
+            self.Discard()
+            raise
+
+        self.writer.Written(self.filepath, self.directory)
+
+    def Discard(self):
+        """
+        Remove the temporary file, leaving the destination as it was
+        """
+        self.temp_file.close()
+        try:
+            os.remove(self.temp_path)
+        except FileNotFoundError:
+            pass
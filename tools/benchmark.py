@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+
+#   Rocket - Benchmark
+#
+#   Joe Gibson (gibsjose@mail.gvsu.edu)
+#
+#   17 August 2015
+#
+#   http://gibsjose.com
+#   http://github.com/gibsjose/Rocket
+
+# Times `Rocket.Create` + `Rocket.Config` for every bundled language (with
+# and without git), for growing author/website lists, skeletons with many
+# files, and `--batch` runs with many projects. Results are written as JSON
+# and can be compared against an earlier run to flag regressions.
+#
+#   ./tools/benchmark.py [--full] [--runs N] [--output results.json]
+#   ./tools/benchmark.py --compare baseline.json [--threshold 0.1]
+
+# Essential Modules
+import sys
+import os
+import argparse
+import contextlib
+import platform
+import shutil
+import statistics
+import tempfile
+import time
+
+# Other Modules
+import json         # JSON
+
+# Rocket's own modules live next to `main.py`
+RocketDirectory = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, os.path.join(RocketDirectory, 'rocket'))
+
+import main as rocket_main
+import rocket.batch
+
+# Input sizes: the default scales, and the `--full` scales
+Scales = {
+    'quick': {'authors': [1, 10, 100, 1000], 'skeleton': [1, 10, 100], 'batch': [1, 10, 100]},
+    'full': {'authors': [1, 10, 100, 1000, 10000], 'skeleton': [1, 10, 100, 1000], 'batch': [1, 10, 100, 1000, 10000]}
+}
+
+Languages = ['c', 'cpp', 'avr-c', 'avr-cpp', 'python']
+
+class Benchmark:
+    """
+    Runs each case a number of times in fresh directories and records the timings
+    """
+    def __init__(self, runs, jobs=None):
+        """
+        Sets the number of runs per case and the worker count for batch cases
+        """
+        self.runs = runs
+        self.jobs = jobs
+        self.results = {}
+        self.work = tempfile.mkdtemp(prefix='benchmark-')
+
+    def Time(self, name, case):
+        """
+        Time `case(directory)` once per run, each time in a new empty directory
+        """
+        timings = []
+        for run in range(self.runs):
+            directory = os.path.join(self.work, 'run')
+            os.makedirs(directory)
+
+            try:
+                with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                    start = time.perf_counter()
+                    case(directory)
+                    timings.append(time.perf_counter() - start)
+            finally:
+                shutil.rmtree(directory)
+
+        self.results[name] = {'runs': len(timings), 'min': min(timings), 'median': statistics.median(timings)}
+        print('\t> ' + name.ljust(32) + '%10.2f ms' % (self.results[name]['median'] * 1000))
+
+    def Project(self, language, overrides=None, r_dir=None):
+        """
+        Case: create and configure a single project
+        """
+        def case(directory):
+            builder = rocket_main.Rocket(r_dir=r_dir or RocketDirectory)
+            builder.Create(language, 'Benchmark Project', directory, overrides)
+            builder.Config(directory)
+        return case
+
+    def Batch(self, count):
+        """
+        Case: create and configure `count` projects with `--batch`
+        """
+        def case(directory):
+            manifest = os.path.join(directory, 'manifest.jsonl')
+            with open(manifest, 'w') as manifest_file:
+                for i in range(count):
+                    spec = {'project': 'Project ' + str(i), 'language': Languages[i % len(Languages)],
+                            'directory': os.path.join(directory, 'project-' + str(i))}
+                    manifest_file.write(json.dumps(spec) + '\n')
+
+            results = rocket.batch.Batch(rocket_main.CreateProject, self.jobs).Run(manifest)
+            failed = [result for result in results if result.error]
+            if failed:
+                raise Exception('Batch project failed: ' + failed[0].error)
+        return case
+
+    def SkeletonRoot(self, count):
+        """
+        A copy of the Rocket directory with a `bench` language whose skeleton has `count` C files
+        """
+        root = os.path.join(self.work, 'root-' + str(count))
+        if os.path.exists(root):
+            return root
+
+        os.makedirs(root)
+        shutil.copy(os.path.join(RocketDirectory, 'config.json'), root)
+        shutil.copytree(os.path.join(RocketDirectory, 'languages'), os.path.join(root, 'languages'))
+
+        language = os.path.join(root, 'languages', 'bench')
+        shutil.copytree(os.path.join(root, 'languages', 'c'), language)
+        os.rename(os.path.join(language, 'c.gitignore'), os.path.join(language, 'bench.gitignore'))
+
+        skeleton = os.path.join(language, 'skeleton')
+        with open(os.path.join(skeleton, 'rocket.c')) as source:
+            text = source.read()
+        for i in range(1, count):
+            with open(os.path.join(skeleton, 'rocket_' + str(i) + '.c'), 'w') as extra:
+                extra.write(text.replace('int main(', 'int main_' + str(i) + '('))
+
+        return root
+
+    def Run(self, scales):
+        """
+        Run every benchmark case
+        """
+        for language in Languages:
+            self.Time('project/' + language, self.Project(language))
+            self.Time('project/' + language + '+git', self.Project(language, {'git': True}))
+
+        for count in scales['authors']:
+            authors = [{'name': 'Author ' + str(i), 'email': 'author' + str(i) + '@example.com'} for i in range(count)]
+            self.Time('authors/' + str(count), self.Project('c', {'authors': authors}))
+
+            websites = ['https://example.com/' + str(i) for i in range(count)]
+            self.Time('websites/' + str(count), self.Project('c', {'websites': websites}))
+
+        for count in scales['skeleton']:
+            self.Time('skeleton/' + str(count), self.Project('bench', r_dir=self.SkeletonRoot(count)))
+
+        for count in scales['batch']:
+            self.Time('batch/' + str(count), self.Batch(count))
+
+    def Save(self, filepath):
+        """
+        Write the results as JSON
+        """
+        data = {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'runs': self.runs,
+            'results': self.results
+        }
+        with open(filepath, 'w') as out_file:
+            json.dump(data, out_file, sort_keys=True, indent=4)
+
+def Compare(baseline_path, current_path, threshold):
+    """
+    Print the change in best (minimum) time for every case, and return the number of regressions
+    """
+    with open(baseline_path) as baseline_file:
+        baseline = json.load(baseline_file)['results']
+    with open(current_path) as current_file:
+        current = json.load(current_file)['results']
+
+    regressions = 0
+    for name in sorted(set(baseline) & set(current)):
+        before = baseline[name]['min']
+        after = current[name]['min']
+        change = (after - before) / before if before else 0.0
+
+        flag = ''
+        if change > threshold:
+            flag = '  ! REGRESSION'
+            regressions += 1
+
+        print('\t> ' + name.ljust(32) + '%10.2f ms -> %10.2f ms  (%+.1f%%)' % (before * 1000, after * 1000, change * 100) + flag)
+
+    return regressions
+
+def main():
+    """
+    Benchmark main
+    """
+    parser = argparse.ArgumentParser(description='benchmark rocket create/config')
+    parser.add_argument('-o', '--output', default='benchmark.json', help='where to write results (default: benchmark.json)')
+    parser.add_argument('-r', '--runs', type=int, default=3, help='runs per case (default: 3)')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='worker processes for batch cases (default: number of CPUs)')
+    parser.add_argument('--full', action='store_true', default=False, help='use the full scales (up to 10k authors/projects, 1k skeleton files)')
+    parser.add_argument('-c', '--compare', metavar='BASELINE', help='compare the results with an earlier results file')
+    parser.add_argument('-t', '--threshold', type=float, default=0.1, help='relative slowdown flagged as a regression (default: 0.1)')
+    args = parser.parse_args()
+
+    benchmark = Benchmark(args.runs, args.jobs)
+    try:
+        benchmark.Run(Scales['full' if args.full else 'quick'])
+    finally:
+        shutil.rmtree(benchmark.work)
+
+    benchmark.Save(args.output)
+    print('Results written to ' + args.output)
+
+    if args.compare:
+        regressions = Compare(args.compare, args.output, args.threshold)
+        if regressions:
+            print(str(regressions) + ' regression(s) over ' + '%.0f%%' % (args.threshold * 100))
+            return 1
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+
+#   Rocket - User Edits Check
+#
+#   Joe Gibson (gibsjose@mail.gvsu.edu)
+#
+#   17 August 2015
+#
+#   http://gibsjose.com
+#   http://github.com/gibsjose/Rocket
+
+# Checks that `rocket config` never overwrites what the user wrote: creates C
+# projects, edits a source file (small, and large enough to be streamed)
+# before the first `rocket config`, runs `rocket config` twice and fails
+# (exit code 1) if the edit is gone.
+#
+#   ./tools/edits.py
+
+# Essential Modules
+import sys
+import os
+import contextlib
+import tempfile
+
+# Rocket's own modules live next to `main.py`
+RocketDirectory = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, os.path.join(RocketDirectory, 'rocket'))
+
+import main as rocket_main
+import rocket.filler
+
+# Appended to the files, as `(name, text)`
+Cases = [
+    ('small source', 'int user_code;\n'),
+    ('streamed source', '/* ' + 'x' * rocket.filler.StreamSize + ' */\nint user_code;\n')
+]
+
+def Check(directory, text):
+    """
+    Whether `text` appended to the C source before the first `rocket config`
+    survives two runs of it
+    """
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        builder = rocket_main.Rocket(r_dir=RocketDirectory)
+        builder.Create('c', 'Edits', directory)
+
+        with open(os.path.join(directory, 'src', 'rocket.c'), 'a') as source_file:
+            source_file.write(text)
+
+        for run in range(2):
+            rocket_main.Rocket(r_dir=RocketDirectory).Config(directory)
+
+    with open(os.path.join(directory, 'src', 'edits.c')) as source_file:
+        return source_file.read().endswith(text)
+
+def main():
+    """
+    User edits check main
+    """
+    failed = False
+    for name, text in Cases:
+        with tempfile.TemporaryDirectory() as directory:
+            if Check(directory, text):
+                print('Kept edit to ' + name)
+            else:
+                print('! Lost edit to ' + name)
+                failed = True
+
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+
+#   Rocket - Import Time Check
+#
+#   Joe Gibson (gibsjose@mail.gvsu.edu)
+#
+#   17 August 2015
+#
+#   http://gibsjose.com
+#   http://github.com/gibsjose/Rocket
+
+# Checks that `rocket --help` stays fast to start: runs it under
+# `python -X importtime` and fails (exit code 1) if it imports any module
+# that only specific commands need, or if the import time it adds on top of
+# a bare interpreter exceeds the budget.
+#
+#   ./tools/importtime.py [--budget MS] [--runs N] [--verbose]
+
+# Essential Modules
+import sys
+import os
+import argparse
+import subprocess
+
+# Modules that must never be imported just to print help (`shutil` is not
+# listed: `argparse` imports it to find the terminal width). Any of them that
+# `argparse` itself imports on the running Python is exempt, e.g. `enum`
+# (through `re`) on Python 3.11
+Forbidden = [
+    'json', 'subprocess', 'tempfile', 'traceback', 'pickle', 'hashlib', 'enum',
+    'datetime', 'concurrent.futures', 'rocket.batch', 'rocket.cache', 'rocket.cleaner',
+    'rocket.configuration', 'rocket.filler', 'rocket.git', 'rocket.language', 'rocket.namer',
+    'rocket.naming', 'rocket.profiler', 'rocket.watcher', 'rocket.template', 'rocket.writer'
+]
+
+# Default budget in ms: best-of-5 runs measured 13 to 21 ms (almost all of it
+# `argparse` and the modules it imports), so about 40% headroom for slower CI machines
+Budget = 30.0
+
+def ImportTimes(arguments):
+    """
+    Run Python with `-X importtime` and return `{module: self time in us}`
+    """
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='')
+    process = subprocess.run([sys.executable, '-X', 'importtime'] + arguments, env=env,
+                             stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, universal_newlines=True)
+
+    times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, module = line[len('import time:'):].split('|')
+        times[module.strip()] = int(self_us)
+
+    return times
+
+def main():
+    """
+    Import time check main
+    """
+    parser = argparse.ArgumentParser(description='check the import time budget of `rocket --help`')
+    parser.add_argument('-b', '--budget', type=float, default=Budget, help='allowed import time in ms on top of a bare interpreter (default: ' + '%g' % Budget + ')')
+    parser.add_argument('-r', '--runs', type=int, default=5, help='take the best of this many runs (default: 5)')
+    parser.add_argument('-v', '--verbose', action='store_true', default=False, help='list the slowest imports')
+    args = parser.parse_args()
+
+    main_script = os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), 'rocket', 'main.py')
+
+    best = None
+    for run in range(args.runs):
+        baseline = ImportTimes(['-c', 'pass'])
+        rocket_times = ImportTimes([main_script, '--help'])
+        added = {module: us for module, us in rocket_times.items() if module not in baseline}
+        total = sum(added.values()) / 1000.0
+        if best is None or total < best[0]:
+            best = (total, added)
+
+    total, added = best
+    failed = False
+
+    argparse_modules = ImportTimes(['-c', 'import argparse'])
+    for module in Forbidden:
+        if module in added and module not in argparse_modules:
+            print('! `rocket --help` imports \'' + module + '\'')
+            failed = True
+
+    if args.verbose:
+        for module, us in sorted(added.items(), key=lambda item: -item[1])[:15]:
+            print('\t' + module + ': ' + str(us / 1000.0) + ' ms')
+
+    print('Import time: ' + '%.1f' % total + ' ms (budget: ' + '%.1f' % args.budget + ' ms)')
+    if total > args.budget:
+        print('! Import time budget exceeded')
+        failed = True
+
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+
+#   Rocket - Startup Time Check
+#
+#   Joe Gibson (gibsjose@mail.gvsu.edu)
+#
+#   17 August 2015
+#
+#   http://gibsjose.com
+#   http://github.com/gibsjose/Rocket
+
+# Checks that generated Python scripts stay fast to start: generates a Python
+# project with a zipapp, runs the script directly, as a module with its
+# bytecode cached and as a zipapp, and fails (exit code 1) if any of them takes
+# longer than the budget on top of a bare interpreter, if the zipapp takes
+# longer than its budget on top of the script, or if any imports a module it
+# does not need.
+#
+#   ./tools/startup.py [--budget MS] [--zipapp-budget MS] [--runs N]
+
+# Essential Modules
+import sys
+import os
+import time
+import argparse
+import tempfile
+import subprocess
+
+# Local Modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), 'rocket'))
+import rocket.bytecode
+import rocket.generator
+
+# Modules the Python skeleton must only import when it needs them (`enum`,
+# `operator` and `re` are not listed: `argparse` imports them)
+Forbidden = ['traceback']
+
+# Allowed startup time in ms on top of a bare interpreter: measured at 17-29 ms
+# (the most `argparse` costs), so about 70% headroom for busy machines
+Budget = 50.0
+
+# Allowed startup time in ms of the zipapp on top of the script: measured at
+# 1-6 ms (`zipimport`); a zipapp is a single file to ship, not a faster start
+ZipappBudget = 15.0
+
+def Time(commands, runs, directory=None):
+    """
+    Best wall times of `runs` runs of each of `commands` (in `directory`), in
+    ms; the commands take turns, so a busy moment slows all of them alike
+    """
+    best = [None] * len(commands)
+    for run in range(runs):
+        for index, command in enumerate(commands):
+            start = time.perf_counter()
+            subprocess.run(command, cwd=directory, stdout=subprocess.DEVNULL, check=True)
+            elapsed = (time.perf_counter() - start) * 1000.0
+            if best[index] is None or elapsed < best[index]:
+                best[index] = elapsed
+
+    return best
+
+def Imports(command, directory=None):
+    """
+    Modules imported by `command` (a Python command line, run in `directory`)
+    """
+    process = subprocess.run(command[:1] + ['-X', 'importtime'] + command[1:], cwd=directory, stdout=subprocess.DEVNULL,
+                             stderr=subprocess.PIPE, universal_newlines=True, check=True)
+
+    return [line.split('|')[-1].strip() for line in process.stderr.splitlines() if line.startswith('import time:')]
+
+def main():
+    """
+    Startup time check main
+    """
+    parser = argparse.ArgumentParser(description='check the startup time budget of generated Python scripts')
+    parser.add_argument('-b', '--budget', type=float, default=Budget, help='allowed startup time in ms on top of a bare interpreter (default: %(default)s)')
+    parser.add_argument('-z', '--zipapp-budget', type=float, default=ZipappBudget, help='allowed startup time in ms of the zipapp on top of the script (default: %(default)s)')
+    parser.add_argument('-r', '--runs', type=int, default=10, help='take the best of this many runs (default: 10)')
+    args = parser.parse_args()
+
+    config = {
+        'project': 'Startup',
+        'language': 'python',
+        'authors': [{'name': 'John Engineer', 'email': 'john@engineer.com'}],
+        'websites': [],
+        'build': {'zipapp': True}
+    }
+
+    failed = False
+    with tempfile.TemporaryDirectory() as directory:
+        rocket.generator.WriteTree(rocket.generator.Generate(config), directory)
+        script = os.path.join(directory, 'startup.py')
+        zipapp = os.path.join(directory, 'startup.pyz')
+
+        # What `"bytecode": true` does at `rocket config` time
+        rocket.bytecode.Compile([script])
+
+        cases = [
+            ('script', [sys.executable, script]),
+            ('module', [sys.executable, '-m', 'startup']),
+            ('zipapp', [sys.executable, zipapp])
+        ]
+
+        for name, command in cases:
+            imported = Imports(command, directory)
+            for module in Forbidden:
+                if module in imported:
+                    print('! The ' + name + ' imports \'' + module + '\'')
+                    failed = True
+
+        times = Time([[sys.executable, '-c', 'pass']] + [command for name, command in cases], args.runs, directory)
+        baseline = times[0]
+        startups = dict(zip([name for name, command in cases], times[1:]))
+
+        for name, command in cases:
+            startup = startups[name] - baseline
+            print(name.capitalize() + ' startup: ' + '%.1f' % startup + ' ms (budget: ' + '%.1f' % args.budget + ' ms)')
+            if startup > args.budget:
+                print('! ' + name.capitalize() + ' startup time budget exceeded')
+                failed = True
+
+        overhead = startups['zipapp'] - startups['script']
+        print('Zipapp over script: ' + '%.1f' % overhead + ' ms (budget: ' + '%.1f' % args.zipapp_budget + ' ms)')
+        if overhead > args.zipapp_budget:
+            print('! Zipapp startup time budget over the script exceeded')
+            failed = True
+
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())